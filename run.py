@@ -1,15 +1,31 @@
+import os
+import sys
 import uvicorn
+from dotenv import load_dotenv
 
 if __name__ == "__main__":
+    load_dotenv()
+
     print("\nDeep Research Engine")
     print("=" * 40)
     print("Web Interface: http://localhost:8000")
     print("API Documentation: http://localhost:8000/docs")
     print("=" * 40 + "\n")
-    
+
+    # uvloop has no Windows support
+    loop = "uvloop" if sys.platform != "win32" else "asyncio"
+
+    # Sessions and pipelines are held in process memory, so extra workers need sticky routing
+    reload = os.getenv("DEV", "0") == "1"
+    workers = None if reload else int(os.getenv("WEB_CONCURRENCY", "1"))
+
     uvicorn.run(
         "src.app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
-    )
\ No newline at end of file
+        loop=loop,
+        http="httptools",
+        ws="websockets",
+        reload=reload,
+        workers=workers
+    )
@@ -1,20 +1,24 @@
 """Main Application. This is the entry point for the web server"""
 
 import os
+import time
 import uuid
+import weakref
 import asyncio
-import tempfile
 from datetime import datetime
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
 from src.pipeline import DeepResearchPipeline
+from src.graphs import build_orchestrator_graph
 from src.utils.logger import log_pipeline, add_log_callback, remove_log_callback
-from src.services import get_session_manager, set_current_session, get_memory_stats
+from src.utils import wire
+from src.utils.wire import send_message, send_envelope, send_error, receive_message
+from src.services import get_session_manager, set_current_session, get_memory_stats, init_http_client, close_http_client
 
 app = FastAPI(title="AI Open Deep Research Engine", version="4.1.0")
 
@@ -30,7 +34,14 @@ app.add_middleware(
 
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-_pipelines = {}
+# Weak refs only: the WebSocket coroutine owns each pipeline, so a leaked session is collected with it
+_pipelines: "weakref.WeakValueDictionary[str, DeepResearchPipeline]" = weakref.WeakValueDictionary()
+
+STATUS_QUEUE_SIZE = 1000
+STATUS_BATCH_SIZE = 50
+
+HEALTH_CACHE_TTL = 1.0
+_health_cache = {"at": 0.0, "body": None}
 
 log_pipeline("Open Deep Research Engine is ready")
 
@@ -41,19 +52,92 @@ async def home():
 
 @app.get("/api/health")
 async def health():
-    """Health check endpoint providing system stats"""
+    """Health check endpoint providing system stats (snapshot refreshed at most once per second)"""
+    now = time.monotonic()
+    if _health_cache["body"] is not None and now - _health_cache["at"] < HEALTH_CACHE_TTL:
+        return _health_cache["body"]
+    
     stats = get_memory_stats()
     is_available = stats.get("available", False)
     
-    return {
+    _health_cache["body"] = {
         "status": "ok",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
         "active_sessions": stats.get("active_sessions", 0),
         "system_usage": {
             "ram_used_mb": round(stats.get("rss_mb", 0), 2) if is_available else "N/A",
             "ram_usage_percent": round(stats.get("percent", 0), 2) if is_available else "N/A"
-        }
+        },
+        "cache": stats.get("cache", {})
     }
+    _health_cache["at"] = now
+    return _health_cache["body"]
+
+async def _status_writer(ws: WebSocket, queue: asyncio.Queue):
+    """Drain queued log lines and send them to the client in batches"""
+    while True:
+        messages = [await queue.get()]
+        while len(messages) < STATUS_BATCH_SIZE:
+            try:
+                messages.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        try:
+            await send_envelope(ws, wire.STATUS_BATCH, messages)
+        except Exception:
+            pass
+
+async def _handle_create_plan(ws: WebSocket, pipeline: DeepResearchPipeline, data: dict):
+    query = data.get("query", "").strip()
+    depth = data.get("depth", "standard")
+    
+    if not query:
+        await send_error(ws, "Query required")
+        return
+    
+    try:
+        plan = await pipeline.create_plan(query, depth)
+        await send_envelope(ws, wire.PLAN_GENERATED, plan)
+    except Exception as e:
+        await send_error(ws, str(e))
+
+async def _handle_refine_plan(ws: WebSocket, pipeline: DeepResearchPipeline, data: dict):
+    try:
+        refined = await pipeline.refine_plan(
+            data.get("query", ""),
+            data.get("depth", "standard"),
+            data.get("current_plan", {}),
+            data.get("feedback", "")
+        )
+        await send_envelope(ws, wire.PLAN_REFINED, refined)
+    except Exception as e:
+        await send_error(ws, str(e))
+
+async def _handle_execute_research(ws: WebSocket, pipeline: DeepResearchPipeline, data: dict):
+    plan = data.get("plan")
+    if not plan: return
+    
+    try:
+        if data.get("enable_streaming", True):
+            await pipeline.execute_research_streaming(plan, ws=ws)
+        else:
+            result = await pipeline.execute_research(plan)
+            await send_envelope(ws, wire.COMPLETE, result)
+
+    except Exception as e:
+        log_pipeline(f"Research error: {e}", level="error")
+        await send_error(ws, str(e))
+
+async def _handle_clear(ws: WebSocket, pipeline: DeepResearchPipeline, data: dict):
+    pipeline.clear()
+    await ws.send_bytes(wire.CLEARED)
+
+_HANDLERS = {
+    "create_plan": _handle_create_plan,
+    "refine_plan": _handle_refine_plan,
+    "execute_research": _handle_execute_research,
+    "clear": _handle_clear
+}
 
 @app.websocket("/ws/search")
 async def websocket_search(ws: WebSocket):
@@ -62,84 +146,43 @@ async def websocket_search(ws: WebSocket):
     session_id = str(uuid.uuid4())
     log_pipeline(f"WebSocket connected (session: {session_id[:8]})")
 
-    await ws.send_json({"type": "session_id", "session_id": session_id})
+    await send_message(ws, {"type": "session_id", "session_id": session_id})
 
     set_current_session(session_id)
-    pipeline = DeepResearchPipeline(session_id)
+    pipeline = DeepResearchPipeline(session_id, orchestrator_graph=app.state.orchestrator_graph)
     _pipelines[session_id] = pipeline
     
-    async def log_to_ws(message: str):
-        try:
-            await ws.send_json({"type": "status", "message": message})
-        except Exception:
-            pass
+    status_queue: asyncio.Queue = asyncio.Queue(maxsize=STATUS_QUEUE_SIZE)
+    writer_task = asyncio.create_task(_status_writer(ws, status_queue))
+    
+    def log_to_ws(message: str):
+        # Drop the oldest line rather than block the pipeline on a slow client
+        if status_queue.full():
+            status_queue.get_nowait()
+        status_queue.put_nowait(message)
     
     add_log_callback(log_to_ws)
     
     try:
         while True:
-
-            data = await ws.receive_json()
-            message_type = data.get("type")
-            
-            if message_type == "create_plan":
-                query = data.get("query", "").strip()
-                depth = data.get("depth", "standard")
-                
-                if not query:
-                    await ws.send_json({"type": "error", "message": "Query required"})
-                    continue
-                
-                try:
-                    plan = await pipeline.create_plan(query, depth)
-                    await ws.send_json({"type": "plan_generated", "plan": plan})
-                except Exception as e:
-                    await ws.send_json({"type": "error", "message": str(e)})
-            
-            elif message_type == "refine_plan":
-                try:
-                    refined = await pipeline.refine_plan(
-                        data.get("query", ""),
-                        data.get("depth", "standard"),
-                        data.get("current_plan", {}),
-                        data.get("feedback", "")
-                    )
-                    await ws.send_json({"type": "plan_refined", "plan": refined})
-                except Exception as e:
-                    await ws.send_json({"type": "error", "message": str(e)})
-            
-            elif message_type == "execute_research":
-                plan = data.get("plan")
-                if not plan: continue
-                
-                try:
-                    if data.get("enable_streaming", True):
-                        await pipeline.execute_research_streaming(plan, ws=ws)
-                    else:
-                        result = await pipeline.execute_research(plan)
-                        await ws.send_json({"type": "complete", "result": result})
-
-                except Exception as e:
-                    log_pipeline(f"Research error: {e}", level="error")
-                    await ws.send_json({"type": "error", "message": str(e)})
-            
-            elif message_type == "clear":
-                pipeline.clear()
-                await ws.send_json({"type": "cleared"})
+            data = await receive_message(ws)
+            handler = _HANDLERS.get(data.get("type"))
+            if handler:
+                await handler(ws, pipeline, data)
                 
     except WebSocketDisconnect:
         log_pipeline(f"WebSocket disconnected (session: {session_id[:8]})")
         
     finally:
         remove_log_callback(log_to_ws)
+        writer_task.cancel()
         get_session_manager().cleanup_session(session_id)
-        _pipelines.pop(session_id, None)
 
 class ExportRequest(BaseModel):
     session_id: str
 
 @app.post("/api/export")
-async def export_report(request: ExportRequest, background_tasks: BackgroundTasks):
+async def export_report(request: ExportRequest):
     """Export research report as a Markdown file"""
     session_id = request.session_id
     pipeline = _pipelines.get(session_id)
@@ -147,36 +190,33 @@ async def export_report(request: ExportRequest, background_tasks: BackgroundTask
     if not pipeline or not getattr(pipeline, 'last_result', None):
         raise HTTPException(status_code=404, detail="No report available")
     
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.md') as tmp:
-        tmp_path = tmp.name
-        
+    from src.utils.export import export_to_markdown_string
+    
     try:
-        from src.utils.export import export_to_markdown_from_json
-        
-        if export_to_markdown_from_json(pipeline.last_result, tmp_path):
-            background_tasks.add_task(os.unlink, tmp_path)
-            
-            return FileResponse(
-                tmp_path, 
-                media_type="text/markdown", 
-                filename="research_report.md"
-            )
-            
-        raise HTTPException(status_code=500, detail="Export failed")
-        
+        md = export_to_markdown_string(pipeline.last_result)
     except Exception as e:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if not md:
+        raise HTTPException(status_code=500, detail="Export failed")
+    
+    return Response(
+        content=md.encode("utf-8"),
+        media_type="text/markdown; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="research_report.md"'}
+    )
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Startup event to initialize periodic cleanup task"""
-    async def periodic_cleanup():
-        while True:
-            await asyncio.sleep(600)
-            get_session_manager().cleanup_old_sessions(max_age_seconds=3600)
-            
-    asyncio.create_task(periodic_cleanup())
-    
\ No newline at end of file
+    """Startup event to compile graphs, open the shared HTTP client and start the session expiry task"""
+    # Graphs are stateless; session state travels in the graph input, so one compile serves every connection
+    app.state.orchestrator_graph = build_orchestrator_graph()
+    init_http_client()
+    asyncio.create_task(get_session_manager().run_expiry_loop())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled HTTP connections"""
+    await close_http_client()
\ No newline at end of file
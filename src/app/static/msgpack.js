@@ -0,0 +1,81 @@
+// Minimal MessagePack encoder for client -> server messages, served from /static
+// instead of a third-party CDN. Covers the JSON-like values the client sends:
+// null, booleans, numbers, strings, arrays and plain objects.
+(function () {
+    const textEncoder = new TextEncoder();
+
+    function encode(value) {
+        const bytes = [];
+        write(value, bytes);
+        return new Uint8Array(bytes);
+    }
+
+    function pushUint(bytes, value, size) {
+        for (let shift = (size - 1) * 8; shift >= 0; shift -= 8) {
+            bytes.push(Math.floor(value / 2 ** shift) & 0xff);
+        }
+    }
+
+    function writeHeader(bytes, length, fix, fixMax, codes) {
+        if (length <= fixMax) {
+            bytes.push(fix | length);
+        } else if (codes[0] !== null && length < 0x100) {
+            bytes.push(codes[0], length);
+        } else if (length < 0x10000) {
+            bytes.push(codes[1]);
+            pushUint(bytes, length, 2);
+        } else {
+            bytes.push(codes[2]);
+            pushUint(bytes, length, 4);
+        }
+    }
+
+    function writeNumber(value, bytes) {
+        if (Number.isSafeInteger(value)) {
+            if (value >= 0 && value < 0x80) return bytes.push(value);
+            if (value < 0 && value >= -0x20) return bytes.push(value & 0xff);
+            if (value >= 0 && value < 0x100000000) {
+                bytes.push(0xce);
+                return pushUint(bytes, value, 4);
+            }
+            if (value < 0 && value >= -0x80000000) {
+                bytes.push(0xd2);
+                return pushUint(bytes, value >>> 0, 4);
+            }
+        }
+        const view = new DataView(new ArrayBuffer(8));
+        view.setFloat64(0, value);
+        bytes.push(0xcb);
+        for (let i = 0; i < 8; i++) bytes.push(view.getUint8(i));
+    }
+
+    function write(value, bytes) {
+        if (value === null || value === undefined) {
+            bytes.push(0xc0);
+        } else if (value === false) {
+            bytes.push(0xc2);
+        } else if (value === true) {
+            bytes.push(0xc3);
+        } else if (typeof value === 'number') {
+            writeNumber(value, bytes);
+        } else if (typeof value === 'string') {
+            const utf8 = textEncoder.encode(value);
+            writeHeader(bytes, utf8.length, 0xa0, 0x1f, [0xd9, 0xda, 0xdb]);
+            for (const b of utf8) bytes.push(b);
+        } else if (Array.isArray(value)) {
+            writeHeader(bytes, value.length, 0x90, 0x0f, [null, 0xdc, 0xdd]);
+            for (const item of value) write(item, bytes);
+        } else if (typeof value === 'object') {
+            const keys = Object.keys(value).filter(key => value[key] !== undefined);
+            writeHeader(bytes, keys.length, 0x80, 0x0f, [null, 0xde, 0xdf]);
+            for (const key of keys) {
+                write(key, bytes);
+                write(value[key], bytes);
+            }
+        } else {
+            throw new TypeError(`Cannot encode ${typeof value} as MessagePack`);
+        }
+    }
+
+    window.MessagePack = { encode };
+})();
@@ -6,6 +6,14 @@ let currentResult = null;
 let currentDepth = 'standard';
 let logsVisible = false;
 
+const textDecoder = new TextDecoder();
+
+// Binary report frames: [kind: u8][length: u32 BE][payload]
+const JSON_FRAME_START = 0x7b; // '{'
+const FRAME_DONE = 0;
+const FRAME_MARKDOWN = 1;
+const FRAME_CITATIONS = 2;
+
 document.addEventListener('DOMContentLoaded', () => {
     connectWebSocket();
     setupButtons();
@@ -14,6 +22,7 @@ document.addEventListener('DOMContentLoaded', () => {
 function connectWebSocket() {
     const protocol = location.protocol === 'https:' ? 'wss:' : 'ws:';
     ws = new WebSocket(`${protocol}//${location.host}/ws/search`);
+    ws.binaryType = 'arraybuffer';
 
     ws.onopen = () => {
         console.log('Connected to server');
@@ -33,8 +42,17 @@ function connectWebSocket() {
     };
 
     ws.onmessage = (event) => {
-        const data = JSON.parse(event.data);
-        handleServerMessage(data);
+        if (typeof event.data === 'string') {
+            handleServerMessage(JSON.parse(event.data));
+            return;
+        }
+
+        const bytes = new Uint8Array(event.data);
+        if (bytes[0] === JSON_FRAME_START) {
+            handleServerMessage(JSON.parse(textDecoder.decode(bytes)));
+        } else {
+            handleStreamFrame(bytes);
+        }
     };
 }
 
@@ -59,6 +77,13 @@ function handleServerMessage(data) {
             addLogEntry(data.message);
             break;
 
+        case 'status_batch':
+            data.messages.forEach(msg => addLogEntry(msg));
+            if (data.messages.length) {
+                updateStatusLabel(data.messages[data.messages.length - 1]);
+            }
+            break;
+
         case 'synthesis_chunk':
             appendToOutput(data.chunk);
             break;
@@ -77,12 +102,36 @@ function handleServerMessage(data) {
     }
 }
 
+function handleStreamFrame(bytes) {
+    const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    const kind = view.getUint8(0);
+    const length = view.getUint32(1);
+    const payload = bytes.subarray(5, 5 + length);
+
+    switch (kind) {
+        case FRAME_MARKDOWN:
+            appendToOutput(textDecoder.decode(payload));
+            break;
+
+        case FRAME_CITATIONS:
+            console.log('Citations:', JSON.parse(textDecoder.decode(payload)));
+            break;
+
+        case FRAME_DONE:
+            break;
+    }
+}
+
 function sendToServer(messageObject) {
     if (!ws || !wsReady) {
         alert('Not connected to server. Please wait...');
         return;
     }
-    ws.send(JSON.stringify(messageObject));
+    if (window.MessagePack) {
+        ws.send(MessagePack.encode(messageObject));
+    } else {
+        ws.send(JSON.stringify(messageObject));
+    }
 }
 
 function setupButtons() {
@@ -1,3 +1,9 @@
-from .memory_cache import SimpleCache, CachedGoogleSearcher, CachedJinaScraper
+from .memory_cache import (
+    LRUCache, TTLCache, SharedScrapeCache, SimpleCache, CachedGoogleSearcher, CachedJinaScraper,
+    shared_scrape_cache, llm_response_cache, response_cache_key, embedding_cache, embedding_cache_key
+)
 
-__all__ = ["SimpleCache", "CachedGoogleSearcher", "CachedJinaScraper"]
\ No newline at end of file
+__all__ = [
+    "LRUCache", "TTLCache", "SharedScrapeCache", "SimpleCache", "CachedGoogleSearcher", "CachedJinaScraper",
+    "shared_scrape_cache", "llm_response_cache", "response_cache_key", "embedding_cache", "embedding_cache_key"
+]
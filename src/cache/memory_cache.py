@@ -1,56 +1,262 @@
 """
-Session-scoped In-Memory Cache. Stores search results and scraped web content to avoid redundant API calls.
+In-Memory Caches. Session-scoped search and scrape caches, plus process-wide caches for scraped
+pages, LLM responses and chunk embeddings, to avoid redundant API calls.
 """
 
-from typing import Dict, List, Optional
+import sys
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
+import httpx
+import orjson
+from src.config.constants import (
+    SEARCH_CACHE_MAX_BYTES, SCRAPE_CACHE_MAX_BYTES, NEGATIVE_CACHE_TTL, SCRAPE_CONCURRENCY,
+    SHARED_SCRAPE_CACHE_MAX_BYTES, SHARED_SCRAPE_TTL, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL,
+    EMBEDDING_CACHE_MAX_BYTES, EMBEDDING_CACHE_TTL
+)
 from src.search.google_search import GoogleSearcher
 from src.search.jina_scraper import JinaWebScraper
 from src.utils.logger import log_rag
+from src.utils.urls import normalize_url
+
+
+def _estimate_size(value: Any) -> int:
+    """Rough in-memory size of a cached value (strings counted by length)"""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _normalize_query(query: str) -> str:
+    """Canonical cache key for a search query (case, whitespace and trailing punctuation ignored)"""
+    return " ".join(query.lower().split()).rstrip(".?! ")
+
+
+class LRUCache:
+    """OrderedDict-backed LRU that evicts the oldest entries once a byte budget is exceeded"""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.evictions = 0
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value for a key and mark it as recently used"""
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+    
+    def set(self, key: str, value: Any):
+        """Insert or replace a value, evicting old entries to stay under budget"""
+        if key in self._data:
+            self.bytes_used -= self._sizes.pop(key)
+            del self._data[key]
+        
+        size = len(key) + _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        
+        self._data[key] = value
+        self._sizes[key] = size
+        self.bytes_used += size
+        
+        while self.bytes_used > self.max_bytes:
+            old_key, _ = self._data.popitem(last=False)
+            self.bytes_used -= self._sizes.pop(old_key)
+            self.evictions += 1
+    
+    def keys(self):
+        return self._data.keys()
+    
+    def clear(self):
+        self._data.clear()
+        self._sizes.clear()
+        self.bytes_used = 0
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache:
+    """Byte-bounded LRU whose entries also go stale after a fixed TTL (stale entries age out of the LRU)"""
+    
+    def __init__(self, max_bytes: int, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self._lru = LRUCache(max_bytes)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh value for a key, or None"""
+        entry = self._lru.get(key)
+        if entry is None or time.monotonic() >= entry[0]:
+            return None
+        self.hits += 1
+        return entry[1]
+    
+    def set(self, key: str, value: Any):
+        self._lru.set(key, (time.monotonic() + self.ttl, value))
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._lru),
+            "bytes_used": self._lru.bytes_used,
+            "hits": self.hits,
+            "evictions": self._lru.evictions
+        }
+
+
+class SharedScrapeCache(TTLCache):
+    """Process-wide scraped pages keyed by normalized URL, so sessions reuse each other's fetches"""
+    
+    def __init__(self, max_bytes: int = SHARED_SCRAPE_CACHE_MAX_BYTES, ttl: float = SHARED_SCRAPE_TTL):
+        super().__init__(max_bytes, ttl)
+    
+    def get(self, url: str) -> Optional[str]:
+        """Return fresh content for a URL, or None"""
+        return super().get(normalize_url(url))
+    
+    def set(self, url: str, content: str):
+        super().set(normalize_url(url), content)
+
+
+def response_cache_key(model: str, prompt: str, max_tokens: int, json_mode: bool) -> str:
+    """Stable fingerprint of an LLM request"""
+    payload = orjson.dumps([model, prompt, max_tokens, json_mode])
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def embedding_cache_key(model: str, text: str) -> str:
+    """Stable fingerprint of a chunk embedding request"""
+    return hashlib.blake2b(f"{model}\0{text}".encode(), digest_size=16).hexdigest()
+
+
+shared_scrape_cache = SharedScrapeCache()
+llm_response_cache = TTLCache(LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL)
+# Vectors are kept as array('f'): about a quarter of the memory of a list of Python floats
+embedding_cache = TTLCache(EMBEDDING_CACHE_MAX_BYTES, EMBEDDING_CACHE_TTL)
 
 
 class SimpleCache:
     
-    def __init__(self):
-        self.search_cache: Dict[str, List[Dict]] = {}
-        self.scrape_cache: Dict[str, str] = {}
+    def __init__(self, search_max_bytes: int = SEARCH_CACHE_MAX_BYTES, scrape_max_bytes: int = SCRAPE_CACHE_MAX_BYTES):
+        self.search_cache = LRUCache(search_max_bytes)
+        self.scrape_cache = LRUCache(scrape_max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.normalized_hits = 0
+        self._negative: Dict[str, float] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
         log_rag("Cache initialized (session-based)")
     
     def get_search(self, query: str) -> Optional[List[Dict]]:
         """Retrieve cached search results for a query"""
-        result = self.search_cache.get(query)
-        if result:
-            log_rag(f"Cache HIT for search: {query[:50]}...")
-        return result
+        entry = self.search_cache.get(_normalize_query(query))
+        if entry and entry["results"]:
+            self.hits += 1
+            if entry["query"] != query:
+                self.normalized_hits += 1
+            log_rag(f"Cache HIT for search: {query[:50]}... (cached as: {entry['query'][:50]})")
+            return entry["results"]
+        
+        self.misses += 1
+        return None
     
     def save_search(self, query: str, results: List[Dict]):
-        """Store search results"""
-        self.search_cache[query] = results
+        """Store search results under the normalized query, keeping the original for logging"""
+        self.search_cache.set(_normalize_query(query), {"query": query, "results": results})
     
     def get_scrape(self, url: str) -> Optional[str]:
         """Retrieve cached content for a URL"""
-        return self.scrape_cache.get(url)
+        content = self.scrape_cache.get(url)
+        if content:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return content
+    
+    def get_scrape_many(self, urls: List[str]) -> Dict[str, str]:
+        """Retrieve cached content for a batch of URLs in one pass (hits logged once)"""
+        wanted = set(urls)
+        have = self.scrape_cache.keys() & wanted
+        found = {url: self.scrape_cache.get(url) for url in urls if url in have}
+        self.hits += len(found)
+        self.misses += len(wanted) - len(found)
+        if found:
+            log_rag(f"Cache HIT for {len(found)}/{len(wanted)} URLs")
+        return found
     
     def save_scrape(self, url: str, content: str):
         """Store scraped content"""
-        self.scrape_cache[url] = content
+        self.scrape_cache.set(url, content)
+    
+    def is_negative(self, key: str) -> bool:
+        """Check whether a key recently returned nothing upstream"""
+        expires_at = self._negative.get(key)
+        if expires_at is None:
+            return False
+        if time.monotonic() >= expires_at:
+            del self._negative[key]
+            return False
+        return True
+    
+    def save_negative(self, key: str, ttl: float = NEGATIVE_CACHE_TTL):
+        """Remember an empty upstream response for a short time"""
+        self._negative[key] = time.monotonic() + ttl
+    
+    def get_inflight(self, key: str) -> Optional[asyncio.Future]:
+        """Return the pending upstream call for a key, if another caller started one"""
+        return self._inflight.get(key)
+    
+    def begin_inflight(self, key: str) -> asyncio.Future:
+        """Register an upstream call so concurrent callers can await it instead of repeating it"""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+    
+    def end_inflight(self, key: str, result: Any):
+        """Publish the result of an upstream call to any waiting callers"""
+        future = self._inflight.pop(key, None)
+        if future and not future.done():
+            future.set_result(result)
     
     def clear(self):
         """Delete all cached data"""
         self.search_cache.clear()
         self.scrape_cache.clear()
+        self._negative.clear()
     
     def get_stats(self) -> Dict[str, int]:
         """Return cache usage statistics."""
         return {
             "search_entries": len(self.search_cache),
-            "scrape_entries": len(self.scrape_cache)
+            "scrape_entries": len(self.scrape_cache),
+            "bytes_used": self.search_cache.bytes_used + self.scrape_cache.bytes_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "normalized_hits": self.normalized_hits,
+            "evictions": self.search_cache.evictions + self.scrape_cache.evictions
         }
 
 
 class CachedGoogleSearcher:
     
-    def __init__(self, api_key: str, cse_id: str, cache: SimpleCache):
-        self.searcher = GoogleSearcher(api_key, cse_id)
+    def __init__(self, api_key: str, cse_id: str, cache: SimpleCache, client: Optional[httpx.AsyncClient] = None):
+        self.searcher = GoogleSearcher(api_key, cse_id, client=client)
         self.cache = cache
     
     async def search(self, query: str, num_results: int = 10) -> List[Dict]:
@@ -59,39 +265,103 @@ class CachedGoogleSearcher:
         if cached:
             return cached[:num_results]
         
-        results = await self.searcher.search(query, num_results)
+        key = f"search:{_normalize_query(query)}"
+        if self.cache.is_negative(key):
+            return []
+        
+        pending = self.cache.get_inflight(key)
+        if pending:
+            return (await pending)[:num_results]
+        
+        self.cache.begin_inflight(key)
+        results: List[Dict] = []
+        try:
+            results = await self.searcher.search(query, num_results)
+        finally:
+            self.cache.end_inflight(key, results)
 
         if results:
             self.cache.save_search(query, results)
+        else:
+            self.cache.save_negative(key)
         
         return results
 
 
 class CachedJinaScraper:
     
-    def __init__(self, cache: SimpleCache):
-        self.scraper = JinaWebScraper()
+    def __init__(self, cache: SimpleCache, client: Optional[httpx.AsyncClient] = None, shared: SharedScrapeCache = shared_scrape_cache):
+        self.scraper = JinaWebScraper(client=client)
         self.cache = cache
+        self.shared = shared
     
     async def scrape_multiple(self, urls: List[str]) -> List[Dict]:
         """Scrape multiple URLs with cache lookup"""
-        results = []
+        results = [item async for item in self.scrape_stream(urls)]
+        log_rag(f"Total: {len(results)} URLs available")
+        return results
+    
+    async def scrape_stream(self, urls: List[str]) -> AsyncIterator[Dict]:
+        """Yield {"url", "content"} for each URL as soon as it is available: cache hits first, then pages as they land"""
+        cached = self.cache.get_scrape_many(urls)
+        for url, content in cached.items():
+            yield {"url": url, "content": content}
+        
         urls_to_scrape = []
+        pending: Dict[str, asyncio.Future] = {}
+        found = len(cached)
         
         for url in urls:
-            cached_content = self.cache.get_scrape(url)
-            if cached_content:
-                results.append({"url": url, "content": cached_content})
+            if url in cached:
+                continue
+            
+            shared_content = self.shared.get(url)
+            if shared_content:
+                self.cache.save_scrape(url, shared_content)
+                found += 1
+                yield {"url": url, "content": shared_content}
+                continue
+            
+            key = f"scrape:{url}"
+            if self.cache.is_negative(key):
+                continue
+            
+            future = self.cache.get_inflight(key)
+            if future:
+                pending[url] = future
             else:
+                self.cache.begin_inflight(key)
                 urls_to_scrape.append(url)
         
         if urls_to_scrape:
-            log_rag(f"Scraping {len(urls_to_scrape)} new URLs (found {len(results)} in cache)...")
-            scraped_data = await self.scraper.scrape_multiple(urls_to_scrape)
+            log_rag(f"Scraping {len(urls_to_scrape)} new URLs (found {found} in cache)...")
+        
+        semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+        
+        async def _scrape_one(url: str):
+            key = f"scrape:{url}"
+            content = None
+            try:
+                async with semaphore:
+                    content = await self.scraper.scrape_url(url)
+            finally:
+                self.cache.end_inflight(key, content)
             
-            for item in scraped_data:
-                self.cache.save_scrape(item['url'], item['content'])
-                results.append(item)
+            if content:
+                self.cache.save_scrape(url, content)
+                self.shared.set(url, content)
+            else:
+                self.cache.save_negative(key)
+            return url, content
         
-        log_rag(f"Total: {len(results)} URLs available")
-        return results
\ No newline at end of file
+        async def _await_pending(url: str, future: asyncio.Future):
+            return url, await future
+        
+        waits = [_scrape_one(url) for url in urls_to_scrape]
+        waits += [_await_pending(url, future) for url, future in pending.items()]
+        
+        # Hand each page over as soon as it lands so one slow URL doesn't hold up the rest
+        for task in asyncio.as_completed(waits):
+            url, content = await task
+            if content:
+                yield {"url": url, "content": content}
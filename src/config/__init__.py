@@ -1,9 +1,9 @@
 # src/config/__init__.py
 """Configuration package."""
 
-from .settings import settings
-from .constants import DEPTH_PARAMS
+from .settings import settings, get_settings, ConfigError
+from .constants import DEPTH_PARAMS, DepthParams
 
 config = settings
 
-__all__ = ["settings", "config", "DEPTH_PARAMS"]
\ No newline at end of file
+__all__ = ["settings", "get_settings", "ConfigError", "config", "DEPTH_PARAMS", "DepthParams"]
\ No newline at end of file
@@ -1,19 +1,32 @@
 """Global Constants"""
 
-DEPTH_PARAMS = {
-    "standard": {
-        "max_results": 12, 
-        "sources_range": "10-15", 
-        "max_searches": 5,
-        "researcher_iterations": 2
-    },
-    "deep": {
-        "max_results": 18, 
-        "sources_range": "15-25", 
-        "max_searches": 8,
-        "researcher_iterations": 3
-    }
-}
+from dataclasses import dataclass
+from types import MappingProxyType
+
+
+@dataclass(frozen=True, slots=True)
+class DepthParams:
+    """Research budget for a depth profile"""
+    max_results: int
+    sources_range: str
+    max_searches: int
+    researcher_iterations: int
+
+
+DEPTH_PARAMS = MappingProxyType({
+    "standard": DepthParams(
+        max_results=12,
+        sources_range="10-15",
+        max_searches=5,
+        researcher_iterations=2
+    ),
+    "deep": DepthParams(
+        max_results=18,
+        sources_range="15-25",
+        max_searches=8,
+        researcher_iterations=3
+    )
+})
 
 DEFAULT_CHUNK_SIZE = 800
 DEFAULT_CHUNK_OVERLAP = 50
@@ -24,8 +37,36 @@ JINA_MODEL = "jina-embeddings-v2-base-en"
 JINA_SCRAPE_URL = "https://r.jina.ai/"
 MAX_CONTENT_LENGTH = 6000
 SCRAPE_TIMEOUT = 15.0
+SCRAPE_CONCURRENCY = 8
+SCRAPE_DOMAIN_DELAY = 0.2
 
 GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
 DEFAULT_SEARCH_RESULTS = 10
 
-MAX_ANSWER_TOKENS = 10000
\ No newline at end of file
+MAX_ANSWER_TOKENS = 10000
+
+# Researcher LLM call ceilings (seconds); past these the node falls back to a heuristic result
+REFLECT_TIMEOUT = 8.0
+SUMMARIZE_TIMEOUT = 30.0
+# One batched summary call writes up to SUMMARY_BATCH_SIZE topics, so it gets a longer ceiling
+SUMMARIZE_BATCH_TIMEOUT = 60.0
+
+# Reflections from concurrent researchers arriving within this window (seconds) share one LLM call
+REFLECT_BATCH_WINDOW = 0.05
+REFLECT_BATCH_SIZE = 5
+
+MAX_PARALLEL_RESEARCHERS = 3
+MAX_RETRY_ATTEMPTS = 3
+MAX_RETRY_BACKOFF = 30.0
+
+SEARCH_CACHE_MAX_BYTES = 4 * 1024 * 1024
+SCRAPE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+NEGATIVE_CACHE_TTL = 60.0
+SHARED_SCRAPE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+SHARED_SCRAPE_TTL = 3600.0
+LLM_CACHE_MAX_BYTES = 16 * 1024 * 1024
+LLM_CACHE_TTL = 3600.0
+EMBEDDING_CACHE_MAX_BYTES = 64 * 1024 * 1024
+EMBEDDING_CACHE_TTL = 24 * 3600.0
+
+SESSION_TTL = 3600.0
\ No newline at end of file
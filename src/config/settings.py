@@ -1,39 +1,70 @@
 """Environment-based configuration"""
 
-from dotenv import load_dotenv
 import os
+from functools import lru_cache
+from typing import Dict, List
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Services still read keys through os.getenv, so keep populating the environment
 load_dotenv()
 
+REQUIRED_KEYS = ("GEMINI_API_KEY", "GOOGLE_SEARCH_API_KEY", "GOOGLE_CSE_ID", "JINA_API_KEY")
+
+
+class ConfigError(ValueError):
+    """Raised at import when required configuration is missing"""
+
+    def __init__(self, missing: List[str]):
+        self.missing = missing
+        super().__init__(f"Missing env vars: {', '.join(missing)}")
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+    GEMINI_API_KEY: str = ""
+    GEMINI_MODEL_FAST: str = "gemini-2.0-flash-lite"
+    GEMINI_MODEL_SMART: str = "gemini-2.0-flash"
+    # Per-operation researcher models; empty means use GEMINI_MODEL_FAST
+    RESEARCHER_REFLECT_MODEL: str = ""
+    RESEARCHER_SUMMARIZE_MODEL: str = ""
+
+    GOOGLE_SEARCH_API_KEY: str = ""
+    GOOGLE_CSE_ID: str = ""
+
+    JINA_API_KEY: str = ""
+
+    def as_dict_for_log(self) -> Dict[str, str]:
+        """Settings with API keys redacted, safe to print"""
+        return {
+            key: ("***" if value else "") if key in REQUIRED_KEYS else value
+            for key, value in self.model_dump().items()
+        }
+
+
+def _assert_required(s: Settings):
+    """Raise ConfigError if any required API key is missing"""
+    missing = [key for key in REQUIRED_KEYS if not getattr(s, key)]
+    if missing:
+        raise ConfigError(missing)
+
+    print("Configuration loaded")
+    print(f"LLM FAST: {s.GEMINI_MODEL_FAST}")
+    print(f"LLM SMART: {s.GEMINI_MODEL_SMART}")
+    print(f"LLM REFLECT: {s.RESEARCHER_REFLECT_MODEL or s.GEMINI_MODEL_FAST}")
+    print(f"LLM SUMMARIZE: {s.RESEARCHER_SUMMARIZE_MODEL or s.GEMINI_MODEL_FAST}")
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse and validate the environment once per process (SKIP_CONFIG_VALIDATION=1 skips the check)"""
+    s = Settings()
+    if os.getenv("SKIP_CONFIG_VALIDATION") != "1":
+        _assert_required(s)
+    return s
+
 
-class Settings:
-    GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
-    GEMINI_MODEL_FAST: str = os.getenv("GEMINI_MODEL_FAST", "gemini-2.0-flash-lite")
-    GEMINI_MODEL_SMART: str = os.getenv("GEMINI_MODEL_SMART", "gemini-2.0-flash")
-    
-    GOOGLE_SEARCH_API_KEY: str = os.getenv("GOOGLE_SEARCH_API_KEY", "")
-    GOOGLE_CSE_ID: str = os.getenv("GOOGLE_CSE_ID", "")
-    
-    JINA_API_KEY: str = os.getenv("JINA_API_KEY", "")
-    
-    @classmethod
-    def validate(cls):
-        missing = []
-        if not cls.GEMINI_API_KEY:
-            missing.append("GEMINI_API_KEY")
-        if not cls.GOOGLE_SEARCH_API_KEY:
-            missing.append("GOOGLE_SEARCH_API_KEY")
-        if not cls.GOOGLE_CSE_ID:
-            missing.append("GOOGLE_CSE_ID")
-        if not cls.JINA_API_KEY:
-            missing.append("JINA_API_KEY")
-        
-        if missing:
-            raise ValueError(f"Missing env vars: {', '.join(missing)}")
-        
-        print("Configuration loaded")
-        print(f"LLM FAST: {cls.GEMINI_MODEL_FAST}")
-        print(f"LLM SMART: {cls.GEMINI_MODEL_SMART}")
-
-
-settings = Settings()
\ No newline at end of file
+# Validate at import so a broken deployment fails before accepting any connection
+settings = get_settings()
@@ -8,42 +8,117 @@ Orchestrator Graph Nodes.
 """
 
 import asyncio
+import contextvars
+import functools
 import hashlib
+import random
 import re
-from typing import Set
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from src.states import OrchestratorState, ResearcherState
+from src.config.constants import MAX_PARALLEL_RESEARCHERS, MAX_RETRY_ATTEMPTS, MAX_RETRY_BACKOFF
 from src.services import get_llm, LLMTier
+from src.nodes.researcher import ReflectionBatcher, reflection_batcher, summarize_batch
 from src.utils.logger import log_orchestrator
+from src.utils.urls import normalize_url
 from src.prompts import get_followup_topics_prompt, get_synthesis_prompt, format_sources_for_synthesis
 
 
+_CITE_RE = re.compile(r'\[([0-9,\s]+)\]')
+_NUM_RE = re.compile(r'\d+')
+_SINGLE_CITE_RE = re.compile(r'\[(\d+)\]')
+
+DEEPEN_CONFIDENCE = 0.60
+SPECULATE_CONFIDENCE = 0.65
+MAX_DEEPEN_ITERATIONS = 4
+SYNTHESIS_MAX_SOURCES = 40
+SUMMARY_BATCH_SIZE = 5
+
+# Set by the pipeline while a client is connected; synthesize_node forwards report text to it as it is generated
+report_stream_sink: contextvars.ContextVar[Optional[Callable[[str], Awaitable[None]]]] = contextvars.ContextVar(
+    "report_stream_sink", default=None
+)
+
+
 def extract_citation_ids(text: str) -> Set[int]:
-    """Extract unique citation numbers [1], [2] from text."""
-    ids = set()
-    for pattern in re.findall(r'\[([0-9,\s]+)\]', text):
-        for part in pattern.split(','):
-            if part.strip().isdigit():
-                ids.add(int(part.strip()))
-    return ids
+    """Extract unique citation numbers [1], [2], [3, 4] from text in a single scan."""
+    return {int(num.group()) for cite in _CITE_RE.finditer(text) for num in _NUM_RE.finditer(cite.group(1))}
+
+def _citation_tail(text: str) -> str:
+    """Trailing '[...' that may be the start of a citation cut off at a chunk boundary"""
+    start = text.rfind('[')
+    if start == -1 or start < text.rfind(']') or len(text) - start > 64:
+        return ""
+    return text[start:]
+
+def remap_citations(text: str, local_to_global: Dict[int, int]) -> str:
+    """Rewrite [local] citations to [global] in one pass, so a rewritten id is never rewritten again."""
+    # Typical for the first topic: nothing to rewrite, so skip the scan and the copy
+    if all(local == glob for local, glob in local_to_global.items()):
+        return text
+    return _SINGLE_CITE_RE.sub(
+        lambda m: f"[{local_to_global.get(int(m.group(1)), m.group(1))}]",
+        text
+    )
+
+def _average_confidence(state: OrchestratorState, default: float = 0) -> float:
+    """Mean researcher confidence from the running totals dispatch_node keeps (default if nothing completed)"""
+    count = state.get("confidence_count", 0)
+    return state.get("confidence_sum", 0.0) / count if count else default
+
+async def generate_followup_topics(query: str, completed: List[dict], avg_confidence: float) -> List[str]:
+    """Ask the LLM for follow-up topics that cover the gaps in the completed research"""
+    # Gaps reported by several topics come first
+    gap_counts = Counter(gap for r in completed for gap in r.get("gaps", []))
+    top_gaps = [gap for gap, _ in gap_counts.most_common(5)]
+    prompt = get_followup_topics_prompt(query, completed, top_gaps, avg_confidence)
+    response = await get_llm(LLMTier.SMART).generate(prompt)
+    return [t.strip().lstrip("- ") for t in response.split("\n") if t.strip()]
+
+def _retry_delay(attempt: int) -> float:
+    """Seconds to wait before retrying: exponential backoff with jitter, capped at MAX_RETRY_BACKOFF"""
+    return min(MAX_RETRY_BACKOFF, 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+def _partition_retries(retry_queue: List[dict], failed_topics: Set[str], pending_topics: Set[str], now: float) -> Tuple[List[dict], List[dict]]:
+    """Split the retry queue into (due, not yet due), moving exhausted topics from pending_topics to failed_topics"""
+    ready, waiting = [], []
+    for item in retry_queue:
+        if now < item.get("next_attempt_at", 0):
+            waiting.append(item)
+        elif item["attempt"] < MAX_RETRY_ATTEMPTS:
+            ready.append(item)
+        else:
+            pending_topics.discard(item["topic"])
+            failed_topics.add(item["topic"])
+            log_orchestrator(f"Giving up on topic: {item['topic'][:30]}. Reached max retries.")
+    return ready, waiting
 
-async def run_single_researcher(topic: str, shared_context: str, global_scraped: Set[str]) -> dict:
+@functools.lru_cache(maxsize=1)
+def _researcher_graph():
+    """Compiled researcher graph, built on first use and shared by every researcher"""
+    # Imported here: src.graphs imports this module
+    from src.graphs import build_researcher_graph
+    return build_researcher_graph()
+
+async def run_single_researcher(topic: str, shared_context: str, global_scraped: Set[str], defer_summary: bool = False) -> dict:
     """
     Run an isolated researcher graph for a specific topic.
     
     Args:
         topic (str): The specific question to research.
         shared_context (str): Context from previous agents to avoid duplication.
-        global_scraped (Set[str]): URLs already visited by other agents.    
+        global_scraped (Set[str]): URLs already visited by other agents. Shared by reference, not copied.
+        defer_summary (bool): Leave the LLM summary to the caller (returned as 'summary_request') for batching.
     """
-    from src.graphs import build_researcher_graph
-    
-    coll_id = f"res_{hashlib.md5(topic.encode()).hexdigest()[:10]}"
+    coll_id = f"res_{hashlib.blake2b(topic.encode(), digest_size=5).hexdigest()}"
     
     initial_state: ResearcherState = {
         "topic": topic,
         "parent_query": shared_context,
         "searches": [],
-        "scraped_urls": list(global_scraped),
+        "seen_urls": global_scraped,
+        "scraped_urls": set(),
         "rag": {"collection_id": coll_id, "chunks_indexed": 0},
         "reflections": [],
         "iteration": 0,
@@ -51,12 +126,14 @@ async def run_single_researcher(topic: str, shared_context: str, global_scraped:
         "scraped_content": [],
         "retrieved_chunks": [],
         "findings": "",
+        "defer_summary": defer_summary,
+        "summary_request": None,
         "sources": [],
         "gaps": [],
         "quality_metrics": None
     }
     
-    return await build_researcher_graph().ainvoke(initial_state)
+    return await _researcher_graph().ainvoke(initial_state)
 
 async def plan_node(state: OrchestratorState) -> dict:
     """Initialize the research session tracking"""
@@ -68,7 +145,10 @@ async def plan_node(state: OrchestratorState) -> dict:
     return {
         "retry_queue": [],
         "global_scraped_urls": set(),
-        "failed_topics": set()
+        "failed_topics": set(),
+        "pending_topics": set(state["sub_topics"]),
+        "confidence_sum": 0.0,
+        "confidence_count": 0
     }
 
 async def dispatch_node(state: OrchestratorState) -> dict:
@@ -76,54 +156,88 @@ async def dispatch_node(state: OrchestratorState) -> dict:
     iteration = state.get("iteration", 0)
     log_orchestrator(f"Dispatch (Iter {iteration + 1})")
     
-    completed_topics = {r["topic"] for r in state["completed"]}
     failed_topics = state.get("failed_topics", set())
+    pending_topics = state.get("pending_topics", set())
     
-    pending = [t for t in state["sub_topics"] if t not in completed_topics and t not in failed_topics]
+    retrying_topics = {item["topic"] for item in state.get("retry_queue", [])}
     
-    ready_retries = []
-    future_retries = []
+    # Walk sub_topics rather than the set to keep the planned order
+    pending = [t for t in state["sub_topics"] if t in pending_topics and t not in retrying_topics]
     
-    for item in state.get("retry_queue", []):
-        wait_time = 2 ** (item["attempt"] - 1)
-        if iteration - item.get("last_attempt_at", 0) >= wait_time:
-            if item["attempt"] < 3:
-                ready_retries.append(item)
-            else:
-                failed_topics.add(item["topic"])
-                log_orchestrator(f"Giving up on topic: {item['topic'][:30]}. Reached max retries.")
-        else:
-            future_retries.append(item)
+    ready_retries, future_retries = _partition_retries(state.get("retry_queue", []), failed_topics, pending_topics, time.monotonic())
     
-    BATCH_SIZE = 3
-    tasks_to_run = []
+    if not pending and not ready_retries and future_retries:
+        # Only backed-off topics remain, so wait for the earliest one instead of spinning through the graph
+        delay = min(item["next_attempt_at"] for item in future_retries) - time.monotonic()
+        log_orchestrator(f"Waiting {max(delay, 0):.1f}s for retry backoff")
+        await asyncio.sleep(max(delay, 0))
+        ready_retries, future_retries = _partition_retries(future_retries, failed_topics, pending_topics, time.monotonic())
     
-    for r in ready_retries[:BATCH_SIZE]:
-        tasks_to_run.append({"topic": r["topic"], "is_retry": True})
+    ready_retries_by_topic = {r["topic"]: r for r in ready_retries}
     
-    slots_left = BATCH_SIZE - len(tasks_to_run)
-    for t in pending[:slots_left]:
-        tasks_to_run.append({"topic": t, "is_retry": False})
+    tasks_to_run = [{"topic": r["topic"], "is_retry": True} for r in ready_retries]
+    tasks_to_run += [{"topic": t, "is_retry": False} for t in pending]
     
     if not tasks_to_run:
-        return {"failed_topics": failed_topics, "retry_queue": future_retries}
+        return {"failed_topics": failed_topics, "pending_topics": pending_topics, "retry_queue": future_retries}
     
     context_snippets = [f"- {r['topic']}: {r['findings'][:150]}..." for r in state["completed"][-3:]]
     shared_context = f"Goal: {state['query']}\nPrevious Findings:\n" + "\n".join(context_snippets)
     
     global_scraped = state.get("global_scraped_urls", set())
     
-    coroutines = [
-        run_single_researcher(t["topic"], shared_context, global_scraped)
-        for t in tasks_to_run
-    ]
+    # Launch every ready topic at once; the semaphore caps how many run concurrently
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_RESEARCHERS)
+    
+    # With several topics in flight, their summaries are cheaper written together after they finish
+    defer_summary = len(tasks_to_run) > 1
+    
+    async def _run_limited(topic: str) -> dict:
+        async with semaphore:
+            return await run_single_researcher(topic, shared_context, global_scraped, defer_summary)
     
-    results = await asyncio.gather(*coroutines, return_exceptions=True)
+    coroutines = [_run_limited(t["topic"]) for t in tasks_to_run]
+    
+    # Deepening looks likely, so draft follow-up topics while the researchers run
+    followup_task = None
+    prior_confidence = _average_confidence(state)
+    if (state["completed"] and prior_confidence < SPECULATE_CONFIDENCE
+            and iteration + 1 < min(state["max_iterations"], MAX_DEEPEN_ITERATIONS)):
+        followup_task = asyncio.create_task(
+            generate_followup_topics(state["query"], state["completed"], prior_confidence)
+        )
+    
+    # Sibling researchers reflect at about the same time, so their reflections share LLM calls
+    batcher_token = reflection_batcher.set(ReflectionBatcher() if len(tasks_to_run) > 1 else None)
+    try:
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
+    finally:
+        reflection_batcher.reset(batcher_token)
+    
+    followup_topics = None
+    if followup_task:
+        try:
+            followup_topics = await followup_task
+        except Exception as e:
+            log_orchestrator(f"Speculative follow-up failed: {e}", level="warning")
+    
+    deferred = [r for r in results if not isinstance(r, Exception) and r.get("summary_request")]
+    if deferred:
+        batches = [deferred[i:i + SUMMARY_BATCH_SIZE] for i in range(0, len(deferred), SUMMARY_BATCH_SIZE)]
+        summaries = await asyncio.gather(*(
+            summarize_batch(shared_context, [r["summary_request"] for r in batch]) for batch in batches
+        ))
+        for batch, texts in zip(batches, summaries):
+            for result, text in zip(batch, texts):
+                result["findings"] = text
     
     new_completed = []
     new_sources = []
-    new_scraped = set(global_scraped)
+    url_to_id = state.get("url_to_id", {})
+    unique_sources = state.get("unique_sources", [])
     updated_retry_queue = list(future_retries)
+    confidence_sum = state.get("confidence_sum", 0.0)
+    confidence_count = state.get("confidence_count", 0)
     
     for i, result in enumerate(results):
         task = tasks_to_run[i]
@@ -134,40 +248,69 @@ async def dispatch_node(state: OrchestratorState) -> dict:
             is_retriable = "timeout" in error_msg.lower() or "429" in error_msg
             
             if is_retriable:
-                existing_retry = next((r for r in ready_retries if r["topic"] == topic), None)
+                existing_retry = ready_retries_by_topic.get(topic)
                 attempt = (existing_retry["attempt"] + 1) if existing_retry else 1
                 
+                failed_at = time.monotonic()
+                delay = _retry_delay(attempt)
+                
                 updated_retry_queue.append({
                     "topic": topic,
                     "attempt": attempt,
-                    "last_attempt_at": iteration,
+                    "last_attempt_at": failed_at,
+                    "next_attempt_at": failed_at + delay,
                     "last_error": error_msg
                 })
-                log_orchestrator(f"Re-queueing {topic[:20]} (Attempt {attempt})")
+                log_orchestrator(f"Re-queueing {topic[:20]} (Attempt {attempt}, retry in {delay:.1f}s)")
             else:
+                pending_topics.discard(topic)
                 failed_topics.add(topic)
                 log_orchestrator(f"Failed {topic[:20]}: {error_msg}")
             continue
         
+        pending_topics.discard(topic)
         metrics = result.get("quality_metrics", {})
+        confidence_sum += metrics.get("confidence", 0)
+        confidence_count += 1
         log_orchestrator(f"Finished: {topic[:30]} (Conf: {metrics.get('confidence', 0):.2f})")
         
+        # Dedupe at insertion: each URL gets its global id once, the topic keeps its local -> global map
+        citation_map = {}
+        for local_idx, source in enumerate(result["sources"], 1):
+            url = source.get("_norm_url") or normalize_url(source.get("url", ""))
+            if url not in url_to_id:
+                unique_sources.append(source)
+                url_to_id[url] = len(unique_sources)
+                source["id"] = url_to_id[url]
+            citation_map[local_idx] = url_to_id[url]
+        
         new_completed.append({
             "topic": result["topic"],
             "findings": result["findings"],
             "sources": result["sources"],
             "gaps": result["gaps"],
-            "quality_metrics": metrics
+            "quality_metrics": metrics,
+            "citation_map": citation_map
         })
         new_sources.extend(result["sources"])
-        new_scraped.update(result.get("scraped_urls", []))
-        
+    
+    # One union into a new set: researchers of this round still hold global_scraped, so it is never mutated
+    new_scraped = global_scraped.union(*(
+        result.get("scraped_urls", ()) for result in results if not isinstance(result, Exception)
+    ))
+    
     return {
-        "completed": state["completed"] + new_completed,
-        "all_sources": state["all_sources"] + new_sources,
+        "completed": new_completed,
+        "all_sources": new_sources,
         "retry_queue": updated_retry_queue,
         "global_scraped_urls": new_scraped,
+        "url_to_id": url_to_id,
+        "unique_sources": unique_sources,
         "failed_topics": failed_topics,
+        "pending_topics": pending_topics,
+        "followup_topics": followup_topics,
+        "confidence_sum": confidence_sum,
+        "confidence_count": confidence_count,
         "iteration": iteration + 1
     }
 
@@ -175,84 +318,90 @@ async def critique_node(state: OrchestratorState) -> dict:
     """
     Evaluate if we need to deepen the research.
     Trigger condition: Average confidence < 0.6
+    Reuses follow-up topics drafted speculatively during dispatch when available.
     """
     completed = state["completed"]
     if not completed:
         return {}
 
-    confidences = [r.get("quality_metrics", {}).get("confidence", 0) for r in completed]
-    avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+    avg_confidence = _average_confidence(state)
     
-    if avg_confidence < 0.60 and state["iteration"] < min(state["max_iterations"], 4):
+    if avg_confidence < DEEPEN_CONFIDENCE and state["iteration"] < min(state["max_iterations"], MAX_DEEPEN_ITERATIONS):
         log_orchestrator(f"Low Confidence ({avg_confidence:.2f}). Generating follow-up topics...")
         
-        all_gaps = []
-        for r in completed:
-            all_gaps.extend(r.get("gaps", []))
-        
-        prompt = get_followup_topics_prompt(state['query'], completed, list(set(all_gaps))[:5], avg_confidence)
         try:
-            llm = get_llm(LLMTier.SMART)
-            response = await llm.generate(prompt)
-            new_topics = [t.strip().lstrip("- ") for t in response.split("\n") if t.strip()]
+            new_topics = state.get("followup_topics") or await generate_followup_topics(
+                state["query"], completed, avg_confidence
+            )
             
             existing = set(state["sub_topics"])
             final_new = [t for t in new_topics if t not in existing][:2]
             
             if final_new:
                 log_orchestrator(f"Added {len(final_new)} new topics")
-                return {"sub_topics": state["sub_topics"] + final_new}
+                pending_topics = state.get("pending_topics", set())
+                pending_topics.update(final_new)
+                return {
+                    "sub_topics": final_new,
+                    "pending_topics": pending_topics,
+                    "followup_topics": None
+                }
                 
         except Exception as e:
             log_orchestrator(f"Deepening failed: {e}", level="warning")
 
-    return {}
+    return {"followup_topics": None}
 
 async def synthesize_node(state: OrchestratorState) -> dict:
-    """Compile final report. Re-maps local citations to global citations across all topics"""
+    """Compile final report. Re-maps local citations to the global ids assigned in dispatch"""
     log_orchestrator("Synthesizing report")
     
-    global_sources = []
-    url_to_id = {}
-    formatted_findings = []
-    
-    for result in state["completed"]:
-        local_to_global = {}
-        
-        for local_source in result["sources"]:
-            url = local_source.get("url", "").split("#")[0].rstrip("/")
-            
-            if url not in url_to_id:
-                global_sources.append(local_source)
-                new_id = len(global_sources)
-                url_to_id[url] = new_id
-                local_source["id"] = new_id
-            
-            local_idx = result["sources"].index(local_source) + 1
-            local_to_global[local_idx] = url_to_id[url]
-        
-        findings = result["findings"]
-        for local_id in sorted(local_to_global.keys(), reverse=True):
-            global_id = local_to_global[local_id]
-            findings = re.sub(rf'\[{local_id}\]', f'[{global_id}]', findings)
-            
-        formatted_findings.append(f"Topic: {result['topic']}\n{findings}")
+    global_sources = state.get("unique_sources", [])
+    formatted_findings = [
+        f"Topic: {result['topic']}\n{remap_citations(result['findings'], result.get('citation_map', {}))}"
+        for result in state["completed"]
+    ]
 
-    source_list_text = format_sources_for_synthesis(global_sources)
+    source_list_text = format_sources_for_synthesis(global_sources, max_sources=SYNTHESIS_MAX_SOURCES)
     prompt = get_synthesis_prompt(
         query=state["query"],
         findings_by_topic='\n\n'.join(formatted_findings),
-        source_list=source_list_text
+        source_list=source_list_text,
+        num_sources=min(len(global_sources), SYNTHESIS_MAX_SOURCES)
     )
     
     try:
         llm = get_llm(LLMTier.SMART)
-        report_text = await llm.generate(prompt, max_tokens=8000)
+        sink = report_stream_sink.get()
+        
+        # Collect citations while the report streams in, carrying any citation split across chunks
+        parts = []
+        cited = set()
+        tail = ""
+        # Leading whitespace is held back, so a blank report never reaches the client as if it were real
+        forwarding = False
+        async for chunk in llm.astream(prompt, max_tokens=8000):
+            parts.append(chunk)
+            if sink:
+                if forwarding:
+                    await sink(chunk)
+                elif chunk.strip():
+                    forwarding = True
+                    await sink("".join(parts))
+            window = tail + chunk
+            cited |= extract_citation_ids(window)
+            tail = _citation_tail(window)
+        
+        report_text = "".join(parts)
         
-        cited_ids = sorted(extract_citation_ids(report_text))
+        # A safety-blocked or empty stream ends without raising; treat it like a failed synthesis
+        if not report_text.strip():
+            log_orchestrator("Synthesis returned no text (blocked or empty response)", level="warning")
+            return {"report": "\n".join(formatted_findings)}
+        
+        cited_ids = sorted(cited)
 
-        base_conf = sum(r.get("quality_metrics", {}).get("confidence", 0.5) for r in state["completed"])
-        avg_conf = base_conf / len(state["completed"]) if state["completed"] else 0.5
+        avg_conf = _average_confidence(state, default=0.5)
         
         synthesis_result = {
             "report_text": report_text,
@@ -276,10 +425,7 @@ async def synthesize_node(state: OrchestratorState) -> dict:
 
 def should_continue_orchestrator(state: OrchestratorState) -> str:
     """Dispatch or synthesize?"""
-    completed = {r["topic"] for r in state["completed"]}
-    failed = state.get("failed_topics", set())
-    
-    pending = [t for t in state["sub_topics"] if t not in completed and t not in failed]
+    pending = state.get("pending_topics", set())
     retries = state.get("retry_queue", [])
     
     if (pending or retries) and state["iteration"] < state["max_iterations"]:
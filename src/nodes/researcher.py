@@ -3,18 +3,138 @@ Researcher Graph Nodes.
 Search -> Scrape & Index -> Retrieve -> Reflect -> (Repeat or Summarize)
 """
 
-from typing import Dict
-from urllib.parse import urlparse
+import re
+import asyncio
+import contextvars
+import functools
+from typing import Dict, List, Optional, Set, Tuple
 from src.states import ResearcherState
-from src.services import get_llm, LLMTier
+from src.config.constants import REFLECT_TIMEOUT, SUMMARIZE_TIMEOUT, SUMMARIZE_BATCH_TIMEOUT, REFLECT_BATCH_WINDOW, REFLECT_BATCH_SIZE
+from src.services import get_llm, get_searcher, get_scraper, get_rag_store, LLMTier
 from src.utils.logger import log_researcher
-from src.prompts import get_reflection_prompt, get_summarization_prompt, format_context_chunks
+from src.utils.urls import normalize_url
+from src.prompts import get_reflection_prompt, get_batch_reflection_prompt, get_summarization_prompt, get_batch_summarization_prompt, format_context_chunks
+
+
+_NETLOC_RE = re.compile(r'^[a-z][a-z0-9+.-]*://([^/?#]+)', re.I)
+
+_MIN_RESULT_TEXT_LEN = 15
+
+_ERROR_RE = re.compile("|".join(map(re.escape, ["404 not found", "page not found", "access denied", "robot check"])), re.I)
+
+# Checked in order; the first tier whose pattern occurs in the domain wins
+_DOMAIN_TIERS = tuple(
+    (re.compile("|".join(map(re.escape, domains))), score)
+    for domains, score in [
+        ([".gov", ".edu", "wikipedia.org", "nih.gov", "nature.com"], 0.95),
+        (["github.com", "stackoverflow.com", "arxiv.org", "nytimes.com", "bbc.com"], 0.90),
+        (["medium.com", "linkedin.com", "reddit.com", "twitter.com", "x.com"], 0.60),
+    ]
+)
+
+
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s')
+
+# Boilerplate lead-ins the model sometimes puts before a summary. Labels are dropped; "The research summary"
+# starts a sentence ("The research summary shows X"), so it is rewritten to "Research" instead
+_SUMMARY_PREFIX_RE = re.compile(r'^(?:(Research Summary:|Summary:|According to the summary,)|The research summary)\s*', re.I)
+
+# Retrieval returns at most 10 chunks; this many is treated as enough without asking the LLM
+SUFFICIENT_CHUNKS = 8
+
+# (minimum retrieved chunks, topic confidence), checked in order
+_CHUNK_CONFIDENCE_TIERS = ((8, 0.8), (5, 0.6))
+
+# Combined fact text below this many characters is not worth a summarization call
+MIN_SUMMARY_FACT_CHARS = 50
+
+# At or below this many facts the summary is the facts themselves, listed without an LLM call
+EXTRACTIVE_SUMMARY_MAX_FACTS = 2
 
 
 class ResearcherError(Exception):
     pass
 
 
+class ReflectionBatcher:
+    """
+    Collects reflection requests from concurrently running researchers and answers
+    those that arrive within REFLECT_BATCH_WINDOW with a single LLM call.
+    """
+    
+    def __init__(self, window: float = REFLECT_BATCH_WINDOW, max_batch: int = REFLECT_BATCH_SIZE):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._calls: Set[asyncio.Task] = set()
+    
+    async def reflect(self, item: Dict) -> Dict:
+        """
+        Queue one reflection and wait for its result.
+
+        Args:
+            item (Dict): get_reflection_prompt arguments for one topic.
+
+        Returns:
+            Dict: The parsed reflection, or {} if the batched answer left this topic out.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Hold a reference so the in-flight call is not garbage collected
+            task = asyncio.create_task(self._run(batch))
+            self._calls.add(task)
+            task.add_done_callback(self._calls.discard)
+    
+    async def _run(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        items = [item for item, _ in batch]
+        llm = get_llm(LLMTier.REFLECT)
+        
+        try:
+            if len(items) == 1:
+                results = [await llm.generate_json(get_reflection_prompt(**items[0]), max_tokens=500, use_cache=True)]
+            else:
+                log_researcher(f"Reflecting on {len(items)} topics in one call")
+                data = await llm.generate_json(
+                    get_batch_reflection_prompt(items), max_tokens=500 * len(items), use_cache=True
+                )
+                results = data.get("results") if isinstance(data, dict) else None
+                if not isinstance(results, list):
+                    results = []
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        # Results line up with items by position; a short or malformed answer leaves the rest empty
+        for i, (_, future) in enumerate(batch):
+            if not future.done():
+                result = results[i] if i < len(results) else {}
+                future.set_result(result if isinstance(result, dict) else {})
+
+
+# Set by dispatch_node while several researchers run at once; reflect_node routes its LLM call through it
+reflection_batcher: contextvars.ContextVar[Optional[ReflectionBatcher]] = contextvars.ContextVar(
+    "reflection_batcher", default=None
+)
+
+
 def calculate_source_quality(url: str) -> float:
     """
     Determine a trust score (0.0 - 1.0) based on the domain.
@@ -25,17 +145,16 @@ def calculate_source_quality(url: str) -> float:
     Returns:
         float: Quality score.
     """
-    domain = urlparse(url).netloc.lower()
-    
-    if any(d in domain for d in [".gov", ".edu", "wikipedia.org", "nih.gov", "nature.com"]):
-        return 0.95
-        
-    if any(d in domain for d in ["github.com", "stackoverflow.com", "arxiv.org", "nytimes.com", "bbc.com"]):
-        return 0.90
-        
-    if any(d in domain for d in ["medium.com", "linkedin.com", "reddit.com", "twitter.com", "x.com"]):
-        return 0.60
-        
+    match = _NETLOC_RE.match(url)
+    return _domain_quality(match.group(1).lower() if match else "")
+
+
+@functools.lru_cache(maxsize=4096)
+def _domain_quality(domain: str) -> float:
+    """Trust score for a lowercased domain; cached since the same hosts recur across searches"""
+    for pattern, score in _DOMAIN_TIERS:
+        if pattern.search(domain):
+            return score
     return 0.80
 
 
@@ -49,23 +168,17 @@ def is_valid_search_result(result: dict) -> bool:
     Returns:
         bool: True if the result looks useful.
     """
-    text = (result.get("title", "") + " " + result.get("snippet", "")).lower()
-    error_patterns = ["404 not found", "page not found", "access denied", "robot check"]
-    
-    if any(pattern in text for pattern in error_patterns):
-        return False
-    
-    return len(text) >= 15
+    text = result.get("title", "") + " " + result.get("snippet", "")
+    return len(text) >= _MIN_RESULT_TEXT_LEN and _ERROR_RE.search(text) is None
 
 
 async def search_node(state: ResearcherState) -> Dict:
     """Search for information. Uses the 'next_query' from the previous reflection if available, otherwise uses the topic"""
-    from src.services import get_searcher
     
     query = state["topic"]
     if state["reflections"]:
         last_reflection = state["reflections"][-1]
-        if isinstance(last_reflection, dict) and last_reflection.get("next_query"):
+        if last_reflection.get("next_query"):
             query = last_reflection["next_query"]
     
     log_researcher(f"Searching: {query[:50]}...")
@@ -77,11 +190,12 @@ async def search_node(state: ResearcherState) -> Dict:
         
         if not valid_results:
             log_researcher("No valid results found.", level="warning")
-            return {"searches": state["searches"] + [query]}
+            return {"searches": [query]}
 
         new_sources = [
             {
                 "url": r["link"], 
+                "_norm_url": normalize_url(r["link"]),
                 "title": r["title"], 
                 "snippet": r.get("snippet", "")
             }
@@ -89,61 +203,107 @@ async def search_node(state: ResearcherState) -> Dict:
         ]
         
         return {
-            "searches": state["searches"] + [query],
-            "sources": state["sources"] + new_sources
+            "searches": [query],
+            "sources": new_sources
         }
         
     except Exception as e:
         log_researcher(f"Search failed: {e}", level="error")
-        return {"searches": state["searches"] + [query]}
+        return {"searches": [query]}
 
 
 async def scrape_and_index_node(state: ResearcherState) -> Dict:
     """Scrape URLs and save to Vector Store"""
-    from src.services import get_scraper, get_rag_store
     
-    current_urls = {s["url"] for s in state["sources"]}
-    scraped_already = set(state["scraped_urls"])
+    # seen_urls is the orchestrator's set, shared by reference with sibling researchers: read it, never mutate it
+    seen = state.get("seen_urls", ())
+    scraped_already = state["scraped_urls"]
     
-    to_scrape = list(current_urls - scraped_already)[:5]
+    # Walk sources in order and stop at the fifth new URL instead of deduplicating the whole list
+    to_scrape = []
+    for source in state["sources"]:
+        url = source["url"]
+        if url in seen or url in scraped_already or url in to_scrape:
+            continue
+        to_scrape.append(url)
+        if len(to_scrape) == 5:
+            break
     
     if not to_scrape: return {}
     
     log_researcher(f"Scraping {len(to_scrape)} new URLs...")
     
     try:
-        results = await get_scraper().scrape_multiple(to_scrape)
+        store = get_rag_store()
+        # retrieve_node searches by topic next; embed that query while the pages download and index
+        store.prefetch_query(state["topic"])
+        valid_scrapes = []
+        index_queue: asyncio.Queue = asyncio.Queue()
         
-        valid_scrapes = [r for r in results if r and len(r.get("content", "")) > 100]
+        async def index_pages():
+            """Single consumer: embeds whatever pages queued up while the previous batch was indexing"""
+            indexed, added, errors = 0, 0, []
+            done = False
+            while not done:
+                batch = [await index_queue.get()]
+                while not index_queue.empty():
+                    batch.append(index_queue.get_nowait())
+                if batch[-1] is None:
+                    batch.pop()
+                    done = True
+                if not batch:
+                    continue
+                try:
+                    added += await store.add_documents(
+                        state["rag"]["collection_id"],
+                        batch,
+                        quality_scores={item["url"]: calculate_source_quality(item["url"]) for item in batch}
+                    )
+                    indexed += len(batch)
+                except Exception as e:
+                    errors.append(e)
+            return indexed, added, errors
         
-        quality_map = {}
-        for item in valid_scrapes:
-            url = item.get("url", "")
-            quality_map[url] = calculate_source_quality(url)
-
+        indexer = asyncio.create_task(index_pages())
+        
+        # Index pages as they land, overlapping embedding with the scrapes still in flight
+        scrape_error = None
+        try:
+            async for item in get_scraper().scrape_stream(to_scrape):
+                if len(item.get("content", "")) <= 100:
+                    continue
+                valid_scrapes.append(item)
+                index_queue.put_nowait(item)
+        except asyncio.CancelledError:
+            indexer.cancel()
+            raise
+        except Exception as e:
+            # Pages that already landed are still indexed and reported, so retrieval can use them
+            scrape_error = e
+        finally:
+            index_queue.put_nowait(None)
+        
+        indexed_docs, added_count, errors = await indexer
+        if scrape_error:
+            log_researcher(f"Scraping error: {scrape_error}", level="warning")
+        if errors:
+            log_researcher(f"Indexing failed for {len(errors)} batches: {errors[0]}", level="warning")
         if valid_scrapes:
-            store = get_rag_store()
-            added_count = await store.add_documents(
-                state["rag"]["collection_id"], 
-                valid_scrapes,
-                quality_scores=quality_map
-            )
             log_researcher(f"Indexed {added_count} chunks into memory")
         
         return {
-            "scraped_urls": state["scraped_urls"] + to_scrape,
-            "rag": {**state["rag"], "chunks_indexed": state["rag"]["chunks_indexed"] + len(valid_scrapes)},
-            "scraped_content": state.get("scraped_content", []) + valid_scrapes
+            "scraped_urls": set(to_scrape),
+            "rag": {**state["rag"], "chunks_indexed": state["rag"]["chunks_indexed"] + indexed_docs},
+            "scraped_content": valid_scrapes
         }
         
     except Exception as e:
         log_researcher(f"Scraping error: {e}", level="warning")
-        return {"scraped_urls": state["scraped_urls"] + to_scrape}
+        return {"scraped_urls": set(to_scrape)}
 
 
 async def retrieve_node(state: ResearcherState) -> Dict:
     """Retrieve information from the Vector Store"""
-    from src.services import get_rag_store
     
     if state["rag"]["chunks_indexed"] == 0:
         log_researcher("Skipping retrieval (no data indexed)")
@@ -166,6 +326,59 @@ async def retrieve_node(state: ResearcherState) -> Dict:
         return {"retrieved_chunks": []}
 
 
+def _heuristic_reflection(topic: str, chunks: list) -> Dict:
+    """Reflection result for the clear-cut cases: plenty of chunks (stop) or none at all (search again)"""
+    if not chunks:
+        return {
+            "facts_learned": [],
+            "gaps": [],
+            "confidence": 0.0,
+            "continue_research": True,
+            "next_query": f"{topic} overview"
+        }
+    
+    facts = []
+    for chunk in chunks:
+        sentence = _SENTENCE_END_RE.split(chunk.get("content", "").strip(), 1)[0]
+        if sentence:
+            facts.append(sentence[:200])
+    
+    return {
+        "facts_learned": list(dict.fromkeys(facts)),
+        "gaps": [],
+        "confidence": 0.8,
+        "continue_research": False,
+        "next_query": ""
+    }
+
+
+def _str_list(value) -> List[str]:
+    """The string items of a JSON list; anything that is not a list gives []"""
+    return [item for item in value if isinstance(item, str)] if isinstance(value, list) else []
+
+
+def _parse_reflection(data) -> Dict:
+    """
+    Validate the model's reflection JSON field by field, replacing mistyped values with defaults.
+    gaps and reflections are merged with operator.add outside the node, so a stray string or null
+    there would fail the whole topic instead of this one reflection.
+    """
+    if not isinstance(data, dict):
+        data = {}
+    
+    confidence = data.get("confidence")
+    continue_research = data.get("continue_research")
+    next_query = data.get("next_query")
+    
+    return {
+        "facts_learned": _str_list(data.get("facts_learned")),
+        "gaps": _str_list(data.get("gaps")),
+        "confidence": float(confidence) if isinstance(confidence, (int, float)) and not isinstance(confidence, bool) else 0.5,
+        "continue_research": continue_research if isinstance(continue_research, bool) else False,
+        "next_query": next_query if isinstance(next_query, str) else ""
+    }
+
+
 async def reflect_node(state: ResearcherState) -> Dict:
     """Analyzes what we found and decides: 'Do I know enough, or should I search again'?"""
     iter_count = state["iteration"] + 1
@@ -176,52 +389,51 @@ async def reflect_node(state: ResearcherState) -> Dict:
     num_chunks = len(state["retrieved_chunks"])
     log_researcher(f"Reflecting on {num_chunks} chunks...")
     
-    # if num_chunks >= 8:
-    #     log_researcher("Sufficient content found (Heuristic). Stopping.")
-    #     return {
-    #         "reflections": state["reflections"] + [{
-    #             "facts_learned": [],
-    #             "gaps": [],
-    #             "confidence": 0.8,
-    #             "continue_research": False,
-    #             "next_query": ""
-    #         }],
-    #         "iteration": iter_count
-    #     }
-    
-    context = format_context_chunks(state["retrieved_chunks"])
-    prompt = get_reflection_prompt(
-        topic=state["topic"],
-        parent_query=state.get("parent_query", state["topic"]),
-        context=context,
-        searches=state["searches"],
-        num_chunks=num_chunks
-    )
+    # Clear-cut cases skip the LLM round trip; only the middle band needs a judgement call
+    if num_chunks >= SUFFICIENT_CHUNKS or num_chunks == 0:
+        decision_data = _heuristic_reflection(state["topic"], state["retrieved_chunks"])
+        log_researcher(f"Heuristic decision: Continue={decision_data['continue_research']}")
+        return {
+            "reflections": [decision_data],
+            "iteration": iter_count
+        }
+    
+    item = {
+        "topic": state["topic"],
+        "parent_query": state.get("parent_query", state["topic"]),
+        "context": format_context_chunks(state["retrieved_chunks"]),
+        "searches": state["searches"],
+        "num_chunks": num_chunks
+    }
     
     try:
-        llm = get_llm(LLMTier.FAST)
-        decision_data = await llm.generate_json(prompt, max_tokens=500)
-        
-        if not isinstance(decision_data, dict):
+        batcher = reflection_batcher.get()
+        if batcher:
+            call = batcher.reflect(item)
+        else:
+            call = get_llm(LLMTier.REFLECT).generate_json(get_reflection_prompt(**item), max_tokens=500, use_cache=True)
+        try:
+            decision_data = await asyncio.wait_for(call, REFLECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Fall through to the chunk-count heuristic below instead of stalling the loop
+            log_researcher(f"Reflection timed out after {REFLECT_TIMEOUT:.0f}s", level="warning")
             decision_data = {}
-            
-        decision_data.setdefault("confidence", 0.5)
-        decision_data.setdefault("continue_research", False)
-        decision_data.setdefault("next_query", "")
+        
+        decision_data = _parse_reflection(decision_data)
         
         if num_chunks < 5:
             decision_data['continue_research'] = True
             if not decision_data['next_query']:
-                gaps = decision_data.get('gaps', [])
+                gaps = decision_data['gaps']
                 suffix = gaps[0] if gaps else "overview"
                 decision_data['next_query'] = f"{state['topic']} {suffix}"
         
         log_researcher(f"Decision: Continue={decision_data['continue_research']}, Conf={decision_data['confidence']:.2f}")
         
         return {
-            "reflections": state["reflections"] + [decision_data],
+            "reflections": [decision_data],
             "iteration": iter_count,
-            "gaps": state.get("gaps", []) + decision_data.get("gaps", [])
+            "gaps": decision_data["gaps"]
         }
         
     except Exception as e:
@@ -229,51 +441,86 @@ async def reflect_node(state: ResearcherState) -> Dict:
         return {"iteration": iter_count}
 
 
+def _chunk_confidence(num_chunks: int) -> float:
+    """Topic confidence from how many chunks retrieval returned"""
+    return next((conf for min_chunks, conf in _CHUNK_CONFIDENCE_TIERS if num_chunks >= min_chunks), 0.4)
+
+
+def _quality_metrics(state: ResearcherState, confidence: float) -> Dict:
+    """Quality metrics reported with a topic's findings"""
+    return {
+        "confidence": confidence,
+        "source_count": len(state["sources"]),
+        "iterations_used": state["iteration"],
+        "chunks_retrieved": len(state["retrieved_chunks"])
+    }
+
+
+def _cite_facts(facts: List[str], chunks: List[Dict], sources: List[Dict]) -> Optional[List[str]]:
+    """
+    Append the [n] citation of the chunk each fact was taken from, numbered like the topic's sources.
+
+    Returns:
+        Optional[List[str]]: Cited facts, or None if any fact cannot be traced to a source.
+    """
+    source_ids = {}
+    for i, source in enumerate(sources, 1):
+        source_ids.setdefault(source.get("_norm_url") or normalize_url(source.get("url", "")), i)
+    
+    cited = []
+    for fact in facts:
+        chunk = next((c for c in chunks if isinstance(fact, str) and fact in c.get("content", "")), None)
+        source_id = source_ids.get(normalize_url(chunk.get("url", ""))) if chunk else None
+        if source_id is None:
+            return None
+        cited.append(f"{fact} [{source_id}]")
+    return cited
+
+
 async def summarize_node(state: ResearcherState) -> Dict:
     """Summarize Findings. Compresses all research into a cited summary"""
-    facts = []
-    for r in state["reflections"]:
-        if isinstance(r, dict):
-            facts.extend(r.get("facts_learned", []))
+    # reflect_node only ever appends dicts, so no type filtering is needed here
+    facts = [fact for r in state["reflections"] for fact in r.get("facts_learned", [])]
     
-    if not facts:
+    # Raw chunk prefixes are not statements the reader can use as-is, so they always go to the LLM
+    raw_chunks = not facts
+    if raw_chunks:
         facts = [c.get("content", "")[:150] for c in state["retrieved_chunks"][:8]]
     
+    # Too little material to summarize: the model would only pad or invent, so skip the call
+    if sum(len(f) for f in facts) < MIN_SUMMARY_FACT_CHARS:
+        log_researcher("Nothing to summarize. Skipping LLM call")
+        return {
+            "findings": f"No information found for {state['topic']}",
+            "quality_metrics": _quality_metrics(state, 0.0)
+        }
+    
+    # With only a fact or two the model just restates them, so list them directly, each cited to its chunk's source
+    cited_facts = None
+    if not raw_chunks and len(facts) <= EXTRACTIVE_SUMMARY_MAX_FACTS:
+        cited_facts = _cite_facts(facts, state["retrieved_chunks"], state["sources"])
+    if cited_facts:
+        log_researcher(f"Only {len(facts)} facts. Using extractive summary")
+        return {
+            "findings": "\n".join(f"- {fact}" for fact in cited_facts),
+            "quality_metrics": _quality_metrics(state, _chunk_confidence(len(state["retrieved_chunks"])))
+        }
+    
     sources_list = []
     for i, source in enumerate(state["sources"], 1):
         title = source.get("title", "Untitled")[:60]
         sources_list.append(f"[{i}] {title}")
     
-    prompt = get_summarization_prompt(
-        topic=state["topic"],
-        parent_query=state.get("parent_query", state["topic"]),
-        facts=facts,
-        sources=sources_list
-    )
+    request = {"topic": state["topic"], "facts": facts, "sources": sources_list}
+    metrics = _quality_metrics(state, _chunk_confidence(len(state["retrieved_chunks"])))
+    
+    if state.get("defer_summary"):
+        # The orchestrator writes this topic's summary together with its siblings' in one call
+        return {"summary_request": request, "quality_metrics": metrics}
     
     try:
-        llm = get_llm(LLMTier.FAST)
-        summary = await llm.generate(prompt, max_tokens=1000)
-        
-        summary = summary.replace("Research Summary:", "").replace("Summary:", "").strip()
-        
-        num_chunks = len(state["retrieved_chunks"])
-        if num_chunks >= 8:
-            final_conf = 0.8
-        elif num_chunks >= 5:
-            final_conf = 0.6
-        else:
-            final_conf = 0.4
-            
-        return {
-            "findings": summary,
-            "quality_metrics": {
-                "confidence": final_conf,
-                "source_count": len(state["sources"]),
-                "iterations_used": state["iteration"],
-                "chunks_retrieved": num_chunks
-            }
-        }
+        summary = await _summarize_one(state.get("parent_query", state["topic"]), request)
+        return {"findings": summary, "quality_metrics": metrics}
         
     except Exception as e:
         log_researcher(f"Summarization error: {e}", level="error")
@@ -283,6 +530,85 @@ async def summarize_node(state: ResearcherState) -> Dict:
         }
 
 
+def _clean_summary(text: str) -> str:
+    """Strip or rewrite a boilerplate lead-in at the start of a summary"""
+    return _SUMMARY_PREFIX_RE.sub(lambda m: "" if m.group(1) else "Research ", text.strip(), count=1).strip()
+
+
+async def _summarize_one(parent_query: str, request: Dict) -> str:
+    """Stream a single topic summary under SUMMARIZE_TIMEOUT"""
+    prompt = get_summarization_prompt(
+        topic=request["topic"],
+        parent_query=parent_query,
+        facts=request["facts"],
+        sources=request["sources"]
+    )
+    
+    llm = get_llm(LLMTier.SUMMARIZE)
+    pieces = []
+    
+    async def collect():
+        async for piece in llm.astream(prompt, max_tokens=1000, use_cache=True):
+            pieces.append(piece)
+    
+    try:
+        await asyncio.wait_for(collect(), SUMMARIZE_TIMEOUT)
+    except asyncio.TimeoutError:
+        log_researcher(f"Summarization timed out after {SUMMARIZE_TIMEOUT:.0f}s", level="warning")
+    
+    # A timed-out stream still leaves whatever text arrived; fall back to the raw facts (uncited) only if nothing did
+    summary = "".join(pieces) or " ".join(request["facts"][:5])
+    return _clean_summary(summary)
+
+
+async def summarize_batch(parent_query: str, requests: List[Dict]) -> List[str]:
+    """
+    Summarize several topics with one LLM call.
+
+    Args:
+        parent_query (str): Context shared by the topics.
+        requests (List[Dict]): summary_request dicts left by summarize_node with defer_summary set.
+
+    Returns:
+        List[str]: One summary per request, in order. Topics the batched answer leaves out
+            fall back to an individual summary call.
+    """
+    prompt = get_batch_summarization_prompt(parent_query, requests)
+    log_researcher(f"Summarizing {len(requests)} topics in one call")
+    
+    try:
+        data = await asyncio.wait_for(
+            get_llm(LLMTier.SUMMARIZE).generate_json(prompt, max_tokens=1000 * len(requests), use_cache=True),
+            SUMMARIZE_BATCH_TIMEOUT
+        )
+    except Exception as e:
+        log_researcher(f"Batched summarization failed: {e!r}", level="warning")
+        data = {}
+    
+    if not isinstance(data, dict):
+        data = {}
+    
+    summaries = []
+    for i in range(1, len(requests) + 1):
+        text = data.get(str(i))
+        summaries.append(_clean_summary(text) if isinstance(text, str) else "")
+    
+    async def fill(request: Dict) -> str:
+        try:
+            return await _summarize_one(parent_query, request)
+        except Exception as e:
+            log_researcher(f"Summarization error: {e}", level="error")
+            return f"Error summarizing research on {request['topic']}"
+    
+    missing = [i for i, text in enumerate(summaries) if not text]
+    if missing:
+        filled = await asyncio.gather(*(fill(requests[i]) for i in missing))
+        for i, text in zip(missing, filled):
+            summaries[i] = text
+    
+    return summaries
+
+
 def should_continue(state: ResearcherState) -> str:
     """Decides direction: Search Again? or Finish?"""
     if state["iteration"] >= state["max_iterations"]:
@@ -292,7 +618,7 @@ def should_continue(state: ResearcherState) -> str:
         return "search"
 
     last_decision = state["reflections"][-1]
-    if isinstance(last_decision, dict) and last_decision.get("continue_research", False):
+    if last_decision.get("continue_research", False):
         return "search"
     
     return "summarize"
\ No newline at end of file
@@ -6,22 +6,30 @@ Plan Creation -> Refinement -> Execution -> Reporting
 
 from typing import Dict, Optional, Callable, Awaitable
 from datetime import datetime
-import asyncio
+import orjson
 
 from src.states import OrchestratorState
 from src.graphs import build_orchestrator_graph
-from src.services import get_llm, set_current_session, LLMTier
+from src.nodes.orchestrator import report_stream_sink
+from src.services import get_llm, get_cache, get_rag_store, set_current_session, LLMTier
 from src.config import DEPTH_PARAMS
 from src.utils.logger import log_pipeline
+from src.utils.wire import send_envelope, send_frame, SYNTHESIS_START, COMPLETE, FRAME_MARKDOWN, FRAME_CITATIONS, FRAME_DONE, STREAM_FRAME_SIZE
 from src.prompts import get_topic_breakdown_prompt, get_reasoning_prompt, get_refinement_prompt
 
 
 class DeepResearchPipeline:
     """Manages the lifecycle of a single research session"""
     
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, *, orchestrator_graph=None):
+        """
+        Args:
+            session_id (str): Session whose services this pipeline uses.
+            orchestrator_graph: Precompiled orchestrator graph shared across sessions.
+                Built on demand if not provided.
+        """
         self.session_id = session_id
-        self.graph = build_orchestrator_graph()
+        self.graph = orchestrator_graph if orchestrator_graph is not None else build_orchestrator_graph()
         self.last_result = None
         
         log_pipeline(f"Pipeline created for session {session_id[:8]}")
@@ -40,14 +48,17 @@ class DeepResearchPipeline:
         set_current_session(self.session_id)
         
         params = DEPTH_PARAMS.get(depth, DEPTH_PARAMS["standard"])
-        num_topics = params.get("max_searches", 3)
+        num_topics = params.max_searches
         
         log_pipeline(f"Creating plan for: '{query}' (depth: {depth})")
         
         llm = get_llm(LLMTier.SMART)
+        
+        # Plans depend only on the query text, so the same question asked again (even re-spaced) reuses the cached answers
+        prompt_query = " ".join(query.split())
 
-        topics_prompt = get_topic_breakdown_prompt(query, num_topics)
-        response = await llm.generate(topics_prompt)
+        topics_prompt = get_topic_breakdown_prompt(prompt_query, num_topics)
+        response = await llm.generate(topics_prompt, use_cache=True)
 
         sub_topics = [line.strip() for line in response.strip().split("\n") if line.strip()][:num_topics]
         
@@ -57,8 +68,8 @@ class DeepResearchPipeline:
         
         log_pipeline(f"Generated {len(sub_topics)} sub-topics")
 
-        reasoning_prompt = get_reasoning_prompt(query)
-        reasoning_response = await llm.generate(reasoning_prompt)
+        reasoning_prompt = get_reasoning_prompt(prompt_query)
+        reasoning_response = await llm.generate(reasoning_prompt, use_cache=True)
         
         return {
             "query": query, 
@@ -91,7 +102,7 @@ class DeepResearchPipeline:
         num_topics = len(current_topics)
         
         prompt = get_refinement_prompt(query, current_topics, feedback, num_topics)
-        response = await llm.generate(prompt)
+        response = await llm.generate(prompt, use_cache=True)
         
         new_topics = [line.strip() for line in response.strip().split("\n") if line.strip()]
         
@@ -128,28 +139,37 @@ class DeepResearchPipeline:
         Returns:
             Dict: The final research result.
         """
-        result_data = await self._run_graph_execution(plan, on_progress)
-        
-        if ws:
-            await ws.send_json({"type": "synthesis_start"})
-            
+        if not ws:
+            return await self._run_graph_execution(plan, on_progress)
+        
+        streamed = False
+        
+        async def forward(text: str):
+            nonlocal streamed
+            if not streamed:
+                streamed = True
+                await ws.send_bytes(SYNTHESIS_START)
+            await send_frame(ws, FRAME_MARKDOWN, text.encode("utf-8"))
+        
+        # Report text goes out as the model produces it instead of after the whole graph finishes
+        token = report_stream_sink.set(forward)
+        try:
+            result_data = await self._run_graph_execution(plan, on_progress)
+        finally:
+            report_stream_sink.reset(token)
+        
+        # Synthesis failed before producing text: send whatever report the fallback built
+        if not streamed:
+            await ws.send_bytes(SYNTHESIS_START)
             report_text = result_data["report_text"]
-            chunk_size = 50
-            
-            for i in range(0, len(report_text), chunk_size):
-                chunk = report_text[i:i+chunk_size]
-                await ws.send_json({
-                    "type": "synthesis_chunk",
-                    "chunk": chunk,
-                    "progress": min(100, int((i / len(report_text)) * 100))
-                })
-                await asyncio.sleep(0.02)
-            
-            await ws.send_json({
-                "type": "complete",
-                "result": result_data
-            })
-            
+            for i in range(0, len(report_text), STREAM_FRAME_SIZE):
+                await send_frame(ws, FRAME_MARKDOWN, report_text[i:i+STREAM_FRAME_SIZE].encode("utf-8"))
+        
+        await send_frame(ws, FRAME_CITATIONS, orjson.dumps(result_data["citations"]))
+        await send_frame(ws, FRAME_DONE)
+        
+        await send_envelope(ws, COMPLETE, result_data)
+        
         return result_data
 
     async def _run_graph_execution(self, plan: Dict, on_progress: Optional[Callable[[str], Awaitable]] = None) -> Dict:
@@ -157,7 +177,7 @@ class DeepResearchPipeline:
         set_current_session(self.session_id)
         
         params = DEPTH_PARAMS.get(plan["depth"], DEPTH_PARAMS["standard"])
-        max_iters = params.get("max_searches", 3)
+        max_iters = params.max_searches
         
         log_pipeline(f"Executing research with {len(plan['sub_topics'])} topics")
         
@@ -168,15 +188,25 @@ class DeepResearchPipeline:
             "iteration": 0,
             "max_iterations": max_iters,
             "completed": [],
+            "confidence_sum": 0.0,
+            "confidence_count": 0,
             "all_sources": [],
+            "unique_sources": [],
+            "url_to_id": {},
+            "global_scraped_urls": set(),
             "identified_gaps": [],
             "report": "",
             "synthesis_result": None,
             "retry_queue": [],
+            "followup_topics": None,
             "overall_quality": None,
-            "failed_topics": set()
+            "failed_topics": set(),
+            "pending_topics": set(plan["sub_topics"])
         }
         
+        # Each researcher retrieves with its topic as the query; embed them all in one request up front
+        get_rag_store().prefetch_queries(plan["sub_topics"])
+        
         if on_progress:
             await on_progress("Researching sub-topics...")
         
@@ -191,7 +221,7 @@ class DeepResearchPipeline:
             log_pipeline("No synthesis result, using fallback", level="warning")
             synthesis = {
                 "report_text": result.get("report", "Error: No report generated"),
-                "sources_used": result.get("all_sources", []),
+                "sources_used": result.get("unique_sources", []),
                 "citations": [],
                 "metadata": {"confidence": 0}
             }
@@ -214,7 +244,6 @@ class DeepResearchPipeline:
     def clear(self):
         """Clear session-scoped caches and memory"""
         set_current_session(self.session_id)
-        from src.services import get_cache, get_rag_store
         
         log_pipeline(f"Clearing session {self.session_id[:8]} caches")
         get_cache().clear()
@@ -1,11 +1,37 @@
 """Prompt templates for research pipeline."""
 
-from typing import List, Dict
+from functools import lru_cache
+from string import Formatter
+from typing import List, Dict, Optional
 
 
-def get_topic_breakdown_prompt(query: str, num_topics: int) -> str:
-    """Generate prompt for breaking query into sub-topics"""
-    return f"""Break this research question into {num_topics} specific sub-topics:
+class _Template:
+    """
+    A str.format template split into literal text and fields once, at import.
+    format_map then renders with a single join instead of re-parsing the template text.
+    """
+    __slots__ = ("_pieces",)
+
+    def __init__(self, template: str):
+        self._pieces = tuple((literal, field, spec) for literal, field, spec, _ in Formatter().parse(template))
+
+    def format_map(self, values: Dict) -> str:
+        out = []
+        for literal, field, spec in self._pieces:
+            out.append(literal)
+            if field is not None:
+                value = values[field]
+                out.append(value if type(value) is str and not spec else format(value, spec))
+        return "".join(out)
+
+
+def _bullets(items) -> str:
+    """'- item' lines; str() keeps the occasional non-string fact from a model's JSON printable"""
+    items = list(map(str, items))
+    return "- " + "\n- ".join(items) if items else ""
+
+
+_TOPIC_BREAKDOWN_TEMPLATE = _Template("""Break this research question into {num_topics} specific sub-topics:
 
 Question: "{query}"
 
@@ -23,21 +49,30 @@ Quantum algorithms and quantum gates explained
 Current quantum computers and their applications
 
 Now generate {num_topics} sub-topics for: "{query}"
-"""
+""")
+
+
+@lru_cache(maxsize=256)
+def get_topic_breakdown_prompt(query: str, num_topics: int) -> str:
+    """Generate prompt for breaking query into sub-topics (memoized: plans are re-created for the same query)"""
+    return _TOPIC_BREAKDOWN_TEMPLATE.format_map({
+        "num_topics": num_topics,
+        "query": query
+    })
+
 
+_REASONING_TEMPLATE = _Template("""In 1-2 sentences, explain the research strategy for: "{query}"
 
+Focus on what angles we'll explore and why.""")
+
+
+@lru_cache(maxsize=256)
 def get_reasoning_prompt(query: str) -> str:
     """Generate prompt for explaining research strategy."""
-    return f"""In 1-2 sentences, explain the research strategy for: "{query}"
-
-Focus on what angles we'll explore and why."""
+    return _REASONING_TEMPLATE.format_map({"query": query})
 
 
-def get_refinement_prompt(query: str, current_topics: List[str], feedback: str, num_topics: int) -> str:
-    """Generate prompt for refining research plan based on feedback"""
-    topics_list = '\n'.join(f"- {t}" for t in current_topics)
-    
-    return f"""Refine this research plan based on user feedback.
+_REFINEMENT_TEMPLATE = _Template("""Refine this research plan based on user feedback.
 
 Original Query: "{query}"
 
@@ -50,21 +85,34 @@ Generate {num_topics} improved sub-topics that address the feedback.
 - One per line
 - NO numbering
 - NO markdown formatting
-- Be specific and searchable"""
+- Be specific and searchable""")
 
 
-def get_reflection_prompt(topic: str, parent_query: str, context: str, searches: List[str], num_chunks: int) -> str:
-    """Generate prompt for research reflection and decision-making"""
-    return f"""Analyze research progress on: "{topic}"
+def get_refinement_prompt(query: str, current_topics: List[str], feedback: str, num_topics: int) -> str:
+    """Generate prompt for refining research plan based on feedback"""
+    topics_list = _bullets(current_topics)
+    
+    return _REFINEMENT_TEMPLATE.format_map({
+        "query": query,
+        "topics_list": topics_list,
+        "feedback": feedback,
+        "num_topics": num_topics
+    })
 
-Parent Question: "{parent_query}"
 
-Retrieved Content ({num_chunks} chunks):
-{context}
+# Shared by the single and batched reflection prompts
+_REFLECTION_RULES = """Rules:
+- confidence should reflect content quality and completeness
+- If chunks are insufficient or low quality, continue_research should be true
+- next_query should target identified gaps
+- If no new info in last 2 searches, stop
+"""
 
-Previous Searches: {', '.join(searches)}
+# Static instructions come first and per-call data last, most volatile at the very end: searches only grow
+# between iterations while the retrieved context changes every time, so repeated calls share the longest prefix
+_REFLECTION_TEMPLATE = _Template("""You are analyzing research progress on a sub-topic of a larger question.
 
-Evaluate the quality of retrieved information and decide next steps.
+Evaluate the quality of the retrieved information below and decide next steps.
 
 Return valid JSON with this structure:
 {{
@@ -75,29 +123,74 @@ Return valid JSON with this structure:
     "next_query": "specific search query to fill gaps"
 }}
 
-Rules:
-- confidence should reflect content quality and completeness
-- If chunks are insufficient or low quality, continue_research should be true
-- next_query should target identified gaps
-- If no new info in last 2 searches, stop"""
+""" + _REFLECTION_RULES + """
+Topic: "{topic}"
 
+Parent Question: "{parent_query}"
 
-def get_summarization_prompt(topic: str, parent_query: str, facts: List[str], sources: List[str]) -> str:
-    """Generate prompt for final summary of research findings"""
-    facts_text = '\n'.join(f"- {f}" for f in facts[:20])
-    sources_text = '\n'.join(sources)
-    
-    return f"""Write a focused research summary about: "{topic}"
+Previous Searches: {searches_text}
 
-This is part of a larger report on: "{parent_query}"
+Retrieved Content ({num_chunks} chunks):
+{context}""")
 
-Key Information Found:
-{facts_text}
 
-Sources Available for Citation:
-{sources_text}
+def get_reflection_prompt(topic: str, parent_query: str, context: str, searches: List[str], num_chunks: int) -> str:
+    """Generate prompt for research reflection and decision-making"""
+    searches_text = ', '.join(searches)
+    
+    return _REFLECTION_TEMPLATE.format_map({
+        "topic": topic,
+        "parent_query": parent_query,
+        "num_chunks": num_chunks,
+        "context": context,
+        "searches_text": searches_text
+    })
+
+
+_BATCH_REFLECTION_TEMPLATE = _Template("""You are analyzing research progress on several sub-topics of a larger question.
+
+Evaluate the quality of the retrieved information for EACH numbered sub-topic below and decide its next steps.
+
+Return valid JSON with one result per sub-topic, in the same order:
+{{"results": [
+    {{
+        "facts_learned": ["fact1", "fact2"],
+        "gaps": ["missing info 1", "missing info 2"],
+        "confidence": 0.0-1.0,
+        "continue_research": true|false,
+        "next_query": "specific search query to fill gaps"
+    }}
+]}}
+
+""" + _REFLECTION_RULES + """
+{topics_text}""")
+
+
+def get_batch_reflection_prompt(items: List[Dict]) -> str:
+    """
+    Generate one prompt that reflects on several sub-topics at once.
+
+    Args:
+        items (List[Dict]): Each with the get_reflection_prompt arguments
+            ('topic', 'parent_query', 'context', 'searches', 'num_chunks').
+
+    Returns:
+        str: Prompt asking for {"results": [...]}, one reflection per item in order.
+    """
+    topics_text = '\n\n'.join(
+        f'=== [{i}] ===\n'
+        f'Topic: "{item["topic"]}"\n'
+        f'Parent Question: "{item["parent_query"]}"\n'
+        f'Previous Searches: {", ".join(item["searches"])}\n'
+        f'Retrieved Content ({item["num_chunks"]} chunks):\n{item["context"]}'
+        for i, item in enumerate(items, 1)
+    )
+    
+    return _BATCH_REFLECTION_TEMPLATE.format_map({"topics_text": topics_text})
+
 
-Write a clear, factual summary (3-5 sentences) that:
+# Shared by the single and batched summary prompts so both keep the same static prefix after the first line
+_SUMMARY_RULES = """Write a clear, factual summary (3-5 sentences) that:
 1. States WHAT was found (specific facts, numbers, names)
 2. CITES sources using [1], [2], [3] format for ALL factual claims
 3. Presents information DIRECTLY - no meta-commentary
@@ -108,7 +201,7 @@ CRITICAL: Write in a UNIFIED voice. This will be integrated into a larger report
 
 CITATION REQUIREMENTS:
 - Every factual claim MUST have a citation: "MC Lyte was a pioneer [1]"
-- Use ONLY the numbered sources above [1], [2], [3]...
+- Use ONLY the numbered sources listed below [1], [2], [3]...
 - Multiple sources: "This is supported by research [1, 2, 3]"
 - DO NOT write without citations
 
@@ -118,16 +211,75 @@ WRONG (no citations):
 RIGHT (with citations):
 - "MC Lyte [1] was a pioneer in hip hop [1, 2]"
 - "Queen Latifah [3] and MC Lyte [1] were pioneers [1, 3]"
+"""
 
-Write the summary now (3-5 sentences with citations):"""
+_SUMMARIZATION_TEMPLATE = _Template("""Write a focused research summary of the topic below. It is part of a larger report.
 
+""" + _SUMMARY_RULES + """
+Topic: "{topic}"
 
-def get_followup_topics_prompt(query: str, completed: List[Dict], gaps: List[str], avg_confidence: float) -> str:
-    """Generate prompt for identifying research gaps and new topics"""
-    completed_text = '\n'.join(f"- {r['topic']}" for r in completed)
-    gaps_text = '\n'.join(f"- {g}" for g in gaps[:5])
+Larger report on: "{parent_query}"
+
+Key Information Found:
+{facts_text}
+
+Sources Available for Citation:
+{sources_text}
+
+Write the summary now (3-5 sentences with citations):""")
+
+
+def get_summarization_prompt(topic: str, parent_query: str, facts: List[str], sources: List[str]) -> str:
+    """Generate prompt for final summary of research findings"""
+    facts_text = _bullets(facts[:20])
+    sources_text = '\n'.join(sources)
     
-    return f"""Research on "{query}" is incomplete (Confidence: {avg_confidence:.2f}).
+    return _SUMMARIZATION_TEMPLATE.format_map({
+        "topic": topic,
+        "parent_query": parent_query,
+        "facts_text": facts_text,
+        "sources_text": sources_text
+    })
+
+
+_BATCH_SUMMARIZATION_TEMPLATE = _Template("""Write a focused research summary for EACH numbered topic below. Each is part of a larger report.
+
+""" + _SUMMARY_RULES + """
+Every topic has its own numbered source list. Cite each summary only with its own topic's sources.
+
+Return valid JSON mapping each topic number to its summary:
+{{"1": "summary with citations", "2": "summary with citations"}}
+
+Larger report on: "{parent_query}"
+
+{topics_text}""")
+
+
+def get_batch_summarization_prompt(parent_query: str, items: List[Dict]) -> str:
+    """
+    Generate one prompt that summarizes several topics at once.
+
+    Args:
+        parent_query (str): Context shared by every topic.
+        items (List[Dict]): Each with 'topic', 'facts' and 'sources' (formatted '[N] title' lines).
+
+    Returns:
+        str: Prompt asking for a JSON object keyed by topic number ("1", "2", ...).
+    """
+    topics_text = '\n\n'.join(
+        f'[{i}] Topic: "{item["topic"]}"\n'
+        f"Key Information Found:\n{_bullets(item['facts'][:20])}\n"
+        f"Sources Available for Citation:\n" + '\n'.join(item["sources"])
+        for i, item in enumerate(items, 1)
+    )
+    
+    return _BATCH_SUMMARIZATION_TEMPLATE.format_map({
+        "parent_query": parent_query,
+        "topics_text": topics_text
+    })
+
+
+_FOLLOWUP_TOPICS_TEMPLATE = _Template("""Research on "{query}" is incomplete (Confidence: {avg_confidence:.2f}).
     
 Identified Gaps:
 {gaps_text}
@@ -137,24 +289,26 @@ Current Topics Covered:
 
 Generate 3 NEW, specific search topics to fill these gaps.
 Do not repeat covered topics.
-Output exactly 3 lines, no numbering."""
+Output exactly 3 lines, no numbering.""")
 
 
-def get_synthesis_prompt(query: str, findings_by_topic: str, source_list: str) -> str:
-    """Generate prompt for final report synthesis."""
-    num_sources = len([line for line in source_list.split('\n') if line.strip().startswith('[')])
+def get_followup_topics_prompt(query: str, completed: List[Dict], gaps: List[str], avg_confidence: float) -> str:
+    """Generate prompt for identifying research gaps and new topics"""
+    completed_text = _bullets(r['topic'] for r in completed)
+    gaps_text = _bullets(gaps[:5])
     
-    return f"""You are writing a comprehensive research report on: "{query}"
-
-Below are research findings from multiple topics. Each finding already has citations in [N] format.
+    return _FOLLOWUP_TOPICS_TEMPLATE.format_map({
+        "query": query,
+        "avg_confidence": avg_confidence,
+        "gaps_text": gaps_text,
+        "completed_text": completed_text
+    })
 
-RESEARCH FINDINGS (already cited):
-
-{findings_by_topic}
 
-SOURCES LIST:
+# Same layout as the researcher prompts: fixed instructions first, then the query, findings and sources
+_SYNTHESIS_TEMPLATE = _Template("""You are writing a comprehensive research report on the query below.
 
-{source_list}
+Below the instructions are research findings from multiple topics. Each finding already has citations in [N] format.
 
 YOUR JOB:
 1. Synthesize these findings into ONE cohesive, well-structured report
@@ -165,7 +319,7 @@ YOUR JOB:
 
 CITATION RULES:
 - Keep all existing citations from findings: if findings say "MC Lyte [1]", preserve [1]
-- Use ONLY numbered sources [1] through [{num_sources}]
+- Use ONLY the numbered sources in the SOURCES LIST below
 - Format: [1], [2], [3] or [1, 2, 3] for multiple
 - Every factual claim should have a citation
 - NEVER use formats like [R1], [Topic 1], or [Research Area]
@@ -196,27 +350,43 @@ WRITING STYLE:
 - Be direct - no "the research shows" or "according to findings"
 - NO meta-commentary about the research process
 
-Now write the complete research report (1500-2000 words):"""
+QUERY: "{query}"
+
+RESEARCH FINDINGS (already cited):
+
+{findings_by_topic}
+
+SOURCES LIST ([1] through [{num_sources}]):
+
+{source_list}
+
+Now write the complete research report (1500-2000 words):""")
+
+
+def get_synthesis_prompt(query: str, findings_by_topic: str, source_list: str, num_sources: Optional[int] = None) -> str:
+    """Generate prompt for final report synthesis. Pass num_sources when known to skip re-scanning source_list."""
+    if num_sources is None:
+        num_sources = sum(1 for line in source_list.split('\n') if line.strip().startswith('['))
+    
+    return _SYNTHESIS_TEMPLATE.format_map({
+        "query": query,
+        "findings_by_topic": findings_by_topic,
+        "source_list": source_list,
+        "num_sources": num_sources
+    })
 
 
 def format_sources_for_synthesis(sources: List[Dict], max_sources: int = 40) -> str:
     """Format sources for synthesis prompt with clear numbering"""
-    formatted = []
-    for s in sources[:max_sources]:
-        source_id = s.get('id', 0)
-        title = s.get('title', 'Untitled')[:80]
-        url = s.get('url', '')
-        formatted.append(f"[{source_id}] {title}\n    URL: {url}")
-    
-    return '\n\n'.join(formatted)
+    return '\n\n'.join(
+        f"[{s.get('id', 0)}] {s.get('title', 'Untitled')[:80]}\n    URL: {s.get('url', '')}"
+        for s in sources[:max_sources]
+    )
 
 
 def format_context_chunks(chunks: List[Dict]) -> str:
     """Format retrieved chunks for reflection prompt"""
-    context_parts = []
-    for i, chunk in enumerate(chunks[:5], 1):
-        relevance = chunk.get("score", 0)
-        content = chunk.get("content", "")[:200]
-        context_parts.append(f"[{i}] (relevance: {relevance:.2f})\n{content}")
-    
-    return '\n\n'.join(context_parts)
\ No newline at end of file
+    return '\n\n'.join(
+        f"[{i}] (relevance: {chunk.get('score', 0):.2f})\n{chunk.get('content', '')[:200]}"
+        for i, chunk in enumerate(chunks[:5], 1)
+    )
\ No newline at end of file
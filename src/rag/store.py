@@ -1,11 +1,16 @@
+import asyncio
+import functools
 import hashlib
 import httpx
 import re
-from typing import List, Dict, Optional, Set
+from array import array
+from typing import List, Dict, Optional
 from collections import Counter
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from src.cache.memory_cache import embedding_cache, embedding_cache_key
 from src.utils.logger import log_rag
 
 
@@ -29,6 +34,8 @@ class RAGStore:
         ))
         self._collections: Dict[str, chromadb.Collection] = {}
         self._chunk_metadata: Dict[str, List[Dict]] = {}
+        # Researchers retrieve with their topic every iteration, so query embeddings are reused
+        self._query_embeddings: Dict[str, asyncio.Task] = {}
     
     def _get_collection(self, collection_id: str) -> chromadb.Collection:
         """Get or create a ChromaDB collection."""
@@ -57,6 +64,66 @@ class RAGStore:
             resp.raise_for_status()
             return [d["embedding"] for d in resp.json()["data"]]
     
+    async def _embed_chunks(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed chunk texts, reusing vectors from the process-wide embedding cache.
+
+        Only cache misses are sent to Jina, so pages already indexed by any session
+        (including ones since cleared) are not embedded again.
+        """
+        keys = [embedding_cache_key(self.JINA_MODEL, text) for text in texts]
+        vectors = [embedding_cache.get(key) for key in keys]
+        
+        missing = [i for i, vec in enumerate(vectors) if vec is None]
+        if missing:
+            fresh = await self._embed([texts[i] for i in missing])
+            for i, vec in zip(missing, fresh):
+                vectors[i] = array("f", vec)
+                embedding_cache.set(keys[i], vectors[i])
+        
+        return [vec.tolist() for vec in vectors]
+    
+    def prefetch_query(self, query: str):
+        """Start embedding a search query in the background so a later search() can skip the round trip"""
+        self.prefetch_queries([query])
+    
+    def prefetch_queries(self, queries: List[str]):
+        """Embed every not-yet-known query with a single background Jina request"""
+        missing = [q for q in dict.fromkeys(queries) if q not in self._query_embeddings]
+        if not missing:
+            return
+        
+        batch = asyncio.ensure_future(self._embed(missing))
+        batch.add_done_callback(self._consume_prefetch_error)
+        
+        async def _embedding_at(i: int) -> List[List[float]]:
+            return [(await batch)[i]]
+        
+        for i, query in enumerate(missing):
+            task = asyncio.ensure_future(_embedding_at(i))
+            task.add_done_callback(functools.partial(self._drop_failed_prefetch, query))
+            self._query_embeddings[query] = task
+    
+    def _consume_prefetch_error(self, task: asyncio.Future):
+        """Retrieve a failed prefetch's exception so a query nobody searched does not log 'never retrieved'"""
+        if not task.cancelled() and task.exception() is not None:
+            log_rag(f"Query embedding prefetch failed: {task.exception()}", level="warning")
+    
+    def _drop_failed_prefetch(self, query: str, task: asyncio.Future):
+        """Forget a failed per-query prefetch so the next search() embeds the query again"""
+        if task.cancelled() or task.exception() is not None:
+            if self._query_embeddings.get(query) is task:
+                del self._query_embeddings[query]
+    
+    async def _query_embedding(self, query: str) -> List[List[float]]:
+        """Embedding of a search query, shared with any in-flight or earlier request for the same text"""
+        self.prefetch_query(query)
+        try:
+            return await asyncio.shield(self._query_embeddings[query])
+        except Exception:
+            self._query_embeddings.pop(query, None)
+            raise
+    
     def _context_aware_chunk(self, text: str, url: str, max_size: int = 800) -> List[Dict]:
         """
         Split text into chunks while preserving headers.
@@ -141,7 +208,7 @@ class RAGStore:
         if not all_chunks:
             return 0
         
-        embeddings = await self._embed(all_chunks)
+        embeddings = await self._embed_chunks(all_chunks)
         collection.add(ids=all_ids, embeddings=embeddings, documents=all_chunks, metadatas=all_metas)
         
         if collection_id not in self._chunk_metadata:
@@ -151,13 +218,13 @@ class RAGStore:
         log_rag(f"Added {len(all_chunks)} chunks to {collection_id}")
         return len(all_chunks)
     
-    def _hybrid_score(self, chunk: Dict, query: str, semantic_weight: float = 0.7) -> float:
+    def _hybrid_score(self, chunk: Dict, query_terms: List[str], semantic_weight: float = 0.7) -> float:
         """
         Combine Vector Similarity (Semantic) with Keyword Match (BM25-lite).
         
         Args:
             chunk (Dict): The chunk data including semantic score.
-            query (str): The search query.
+            query_terms (List[str]): Lowercased search query terms, split once per search.
             semantic_weight (float): How much to trust the vector score vs keyword score.
 
         Returns:
@@ -165,9 +232,7 @@ class RAGStore:
         """
         semantic = chunk.get("score", 0)
         
-        content_lower = chunk["content"].lower()
-        query_terms = query.lower().split()
-        content_words = content_lower.split()
+        content_words = chunk["content"].lower().split()
         term_freqs = Counter(content_words)
         
         k1 = 1.5 # saturation parameter
@@ -215,10 +280,15 @@ class RAGStore:
             return []
         
         all_chunks = []
+        query_terms = query.lower().split()
         
-        query_emb = await self._embed([query])
+        query_emb = await self._query_embedding(query)
         
-        results = collection.query(query_embeddings=query_emb,n_results=min(n * 3, collection.count()) )
+        results = collection.query(
+            query_embeddings=query_emb,
+            n_results=min(n * 3, collection.count()),
+            include=["documents", "metadatas", "distances", "embeddings"]
+        )
         
         if not results["ids"] or not results["ids"][0]:
             return []
@@ -235,15 +305,17 @@ class RAGStore:
                 "score": 1 - results["distances"][0][i] if results.get("distances") else 0
             }
             
-            chunk["score"] = self._hybrid_score(chunk, query)
+            chunk["score"] = self._hybrid_score(chunk, query_terms)
             chunk["score"] *= chunk["quality"]
             
             all_chunks.append(chunk)
     
         if use_mmr and len(all_chunks) > 1:
-            mmr_scores = self._calculate_mmr_scores(all_chunks)
-            for i, chunk in enumerate(all_chunks):
-                chunk["mmr_score"] = mmr_scores[i]
+            pool_vecs = np.ascontiguousarray(results["embeddings"][0], dtype=np.float32)
+            relevance = np.fromiter((c["score"] for c in all_chunks), dtype=np.float32, count=len(all_chunks))
+            mmr_scores = self._mmr_select(pool_vecs, relevance)
+            for chunk, mmr in zip(all_chunks, mmr_scores):
+                chunk["mmr_score"] = float(mmr)
             
             all_chunks.sort(key=lambda c: c["mmr_score"], reverse=True)
         else:
@@ -256,41 +328,38 @@ class RAGStore:
         log_rag(f"Retrieved {len(final_chunks)} chunks from {collection_id}")
         return final_chunks
 
-    def _calculate_mmr_scores(self, chunks: List[Dict], lambda_param: float = 0.7) -> List[float]:
+    def _mmr_select(self, pool_vecs: np.ndarray, relevance: np.ndarray, lambda_param: float = 0.7) -> np.ndarray:
         """
-        Calculate Maximal Marginal Relevance.
+        Greedy Maximal Marginal Relevance over chunk embeddings.
+
+        All pairwise cosine similarities come from one matrix product; the greedy loop
+        then only updates a running max-similarity vector.
 
         Args:
-            chunks (List[Dict]): List of chunk dicts with 'content' and 'score'.
+            pool_vecs (np.ndarray): Float32 chunk embeddings, one row per chunk.
+            relevance (np.ndarray): Relevance score of each chunk.
             lambda_param (float): Trade-off parameter. 1.0 = Pure Relevance, 0.0 = Pure Diversity.
 
         Returns:
-            List[float]: MMR scores for each chunk.
+            np.ndarray: MMR score of each chunk at the point it was selected.
         """
-        if not chunks: return []
-        mmr_scores = []
-        selected_indices: Set[int] = set()
-        
-        for i, chunk in enumerate(chunks):
-            if i == 0:
-                mmr_scores.append(chunk.get("score", 0))
-                selected_indices.add(i)
-                continue
-
-            max_sim = 0.0
-            for j in selected_indices:
-                words_i = set(chunk["content"].lower().split())
-                words_j = set(chunks[j]["content"].lower().split())
-                if not words_i or not words_j:
-                    sim = 0.0
-                else:
-                    sim = len(words_i & words_j) / len(words_i | words_j)
-                max_sim = max(max_sim, sim)
-            
+        norms = np.linalg.norm(pool_vecs, axis=1, keepdims=True)
+        unit = pool_vecs / np.maximum(norms, 1e-12)
+        sims = unit @ unit.T
+        
+        count = len(relevance)
+        mmr_scores = np.empty(count, dtype=np.float32)
+        max_sim = np.zeros(count, dtype=np.float32)
+        remaining = np.ones(count, dtype=bool)
+        
+        for _ in range(count):
             # Relevance - (1-lambda) * Redundancy
-            mmr = (lambda_param * chunk.get("score", 0)) - ((1 - lambda_param) * max_sim)
-            mmr_scores.append(mmr)
-            selected_indices.add(i)
+            candidates = lambda_param * relevance - (1 - lambda_param) * max_sim
+            candidates[~remaining] = -np.inf
+            best = int(candidates.argmax())
+            mmr_scores[best] = candidates[best]
+            remaining[best] = False
+            np.maximum(max_sim, sims[best], out=max_sim)
         
         return mmr_scores
     
@@ -339,4 +408,7 @@ class RAGStore:
         except:
             pass
         self._chunk_metadata.clear()
+        for task in self._query_embeddings.values():
+            task.cancel()
+        self._query_embeddings.clear()
         gc.collect()
\ No newline at end of file
@@ -1,6 +1,6 @@
 """Search package"""
 
 from .google_search import GoogleSearcher
-from .jina_scraper import JinaWebScraper
+from .jina_scraper import JinaWebScraper, DomainRateLimiter, domain_limiter
 
-__all__ = ["GoogleSearcher", "JinaWebScraper"]
\ No newline at end of file
+__all__ = ["GoogleSearcher", "JinaWebScraper", "DomainRateLimiter", "domain_limiter"]
\ No newline at end of file
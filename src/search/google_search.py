@@ -15,12 +15,14 @@ class GoogleSearcher:
         api_key (str): Google API key.
         cse_id (str): Custom Search Engine ID.
         base_url (str): The Google API endpoint.
+        client (Optional[httpx.AsyncClient]): Shared client. If None, a client is opened per search.
     """
 
-    def __init__(self, api_key: str, cse_id: str):
+    def __init__(self, api_key: str, cse_id: str, client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key
         self.cse_id = cse_id
         self.base_url = "https://www.googleapis.com/customsearch/v1"
+        self.client = client
         
     async def search(self, query: str, num_results: int = 10) -> List[Dict]:
         """
@@ -37,33 +39,40 @@ class GoogleSearcher:
                 - link (str): The URL of the page.
                 - snippet (str): A brief description/snippet.
         """
+        if self.client is not None:
+            return await self._search_pages(self.client, query, num_results)
+        
         async with httpx.AsyncClient() as client:
-            results = []
-            start_index = 1
-            num_to_fetch = min(num_results, 100)
+            return await self._search_pages(client, query, num_results)
+    
+    async def _search_pages(self, client: httpx.AsyncClient, query: str, num_results: int) -> List[Dict]:
+        """Fetch result pages (10 per request) until num_results are collected"""
+        results = []
+        start_index = 1
+        num_to_fetch = min(num_results, 100)
 
-            while len(results) < num_to_fetch:
-                response_data = await self._search_with_retry(client, query, start_index)
-                
-                if not response_data: break
-                
-                items = response_data.get("items", [])
-                if not items: break
-                
-                for item in items:
-                    results.append({
-                        "title": item.get("title", ""), 
-                        "link": item.get("link", ""), 
-                        "snippet": item.get("snippet", "")
-                    })
-                    
-                    if len(results) >= num_to_fetch: break
+        while len(results) < num_to_fetch:
+            response_data = await self._search_with_retry(client, query, start_index)
+            
+            if not response_data: break
+            
+            items = response_data.get("items", [])
+            if not items: break
+            
+            for item in items:
+                results.append({
+                    "title": item.get("title", ""), 
+                    "link": item.get("link", ""), 
+                    "snippet": item.get("snippet", "")
+                })
                 
-                start_index += 10
-                await asyncio.sleep(0.1)
+                if len(results) >= num_to_fetch: break
             
-            log_search(f"Found {len(results)} results for '{query}'")
-            return results
+            start_index += 10
+            await asyncio.sleep(0.1)
+        
+        log_search(f"Found {len(results)} results for '{query}'")
+        return results
     
     async def _search_with_retry(self, client: httpx.AsyncClient, query: str, start: int) -> Optional[Dict]:
         """
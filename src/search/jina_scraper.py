@@ -1,24 +1,56 @@
 """Jina AI Web Scraper wrapper"""
 
+import time
 import httpx
 import asyncio
 from typing import List, Dict, Optional
+from urllib.parse import urlparse
+from src.config.constants import SCRAPE_DOMAIN_DELAY
 from src.utils.logger import log_scrape
 
+
+class DomainRateLimiter:
+    """Spaces requests to the same domain while letting different domains proceed in parallel"""
+    
+    MAX_TRACKED = 1024
+    
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+    
+    async def wait(self, domain: str):
+        """Reserve the domain's next free slot and sleep until it arrives"""
+        now = time.monotonic()
+        if len(self._next_slot) > self.MAX_TRACKED:
+            self._next_slot = {d: t for d, t in self._next_slot.items() if t > now}
+        
+        # Reserving before sleeping keeps concurrent callers for one domain in order without a lock
+        slot = max(now, self._next_slot.get(domain, 0.0))
+        self._next_slot[domain] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+# Process-wide: sessions scraping the same site share its spacing
+domain_limiter = DomainRateLimiter(SCRAPE_DOMAIN_DELAY)
+
+
 class JinaWebScraper:
     """Client for Jina AI's Reader API"""
 
     BASE_URL = "https://r.jina.ai/"
     TIMEOUT = 10.0
     
-    def __init__(self, max_content_length: int = 6000):
+    def __init__(self, max_content_length: int = 6000, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the scraper.
 
         Args:
             max_content_length (int): Maximum characters to keep per page.
+            client (Optional[httpx.AsyncClient]): Shared client. If None, a client is opened per URL.
         """
         self.max_content_length = max_content_length
+        self.client = client
     
     async def scrape_url(self, url: str) -> Optional[str]:
         """
@@ -30,31 +62,40 @@ class JinaWebScraper:
         Returns:
             Optional[str]: The text content, or None if scraping failed.
         """
+        await domain_limiter.wait(urlparse(url).netloc.lower())
+        
+        if self.client is not None:
+            return await self._fetch(self.client, url)
+        
         async with httpx.AsyncClient(timeout=self.TIMEOUT) as client:
-            try:
-                jina_url = f"{self.BASE_URL}{url}"
-                
-                response = await client.get(jina_url, follow_redirects=True)
-                response.raise_for_status()
-                
-                content = response.text
-                
-                if len(content) > self.max_content_length:
-                    content = content[:self.max_content_length] + "..."
-                
-                log_scrape(f"Scraped {len(content)} chars from {url[:50]}...")
-                return content
-                
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 429:
-                    log_scrape(f"Rate limited (429) for {url[:50]}...", level="warning")
-                    return None
-                log_scrape(f"HTTP {e.response.status_code} for {url[:50]}...", level="warning")
-                return None
+            return await self._fetch(client, url)
+    
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
+        """Fetch one page through the Jina Reader endpoint"""
+        try:
+            jina_url = f"{self.BASE_URL}{url}"
+            
+            response = await client.get(jina_url, follow_redirects=True, timeout=self.TIMEOUT)
+            response.raise_for_status()
+            
+            content = response.text
             
-            except Exception:
+            if len(content) > self.max_content_length:
+                content = content[:self.max_content_length] + "..."
+            
+            log_scrape(f"Scraped {len(content)} chars from {url[:50]}...")
+            return content
+            
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                log_scrape(f"Rate limited (429) for {url[:50]}...", level="warning")
                 return None
-    
+            log_scrape(f"HTTP {e.response.status_code} for {url[:50]}...", level="warning")
+            return None
+        
+        except Exception:
+            return None
+
     async def scrape_multiple(self, urls: List[str], max_concurrent: int = 10) -> List[Dict]:
         """
         Scrapes multiple URLs concurrently with a semaphore limit.
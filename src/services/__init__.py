@@ -2,6 +2,7 @@
 
 from .llm import LLMTier, GeminiLLM
 from .session_manager import get_session_manager, set_current_session, get_current_session, get_current_services, get_memory_stats
+from .http_client import init_http_client, get_http_client, close_http_client
 
 def get_cache():
     return get_current_services().get_cache()
@@ -25,6 +26,9 @@ __all__ = [
     "set_current_session",
     "get_current_session",
     "get_memory_stats",
+    "init_http_client",
+    "get_http_client",
+    "close_http_client",
     "get_cache",
     "get_searcher",
     "get_scraper",
@@ -0,0 +1,34 @@
+"""Process-wide HTTP client shared by all sessions (connection pooling, HTTP/2, keepalive)"""
+
+from typing import Optional
+
+import httpx
+
+from src.config.constants import SCRAPE_TIMEOUT
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def init_http_client() -> httpx.AsyncClient:
+    """Create the shared client. Called once on app startup"""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=256),
+            timeout=SCRAPE_TIMEOUT
+        )
+    return _client
+
+
+def get_http_client() -> Optional[httpx.AsyncClient]:
+    """Return the shared client, or None if the app has not started one"""
+    return _client
+
+
+async def close_http_client():
+    """Close the shared client. Called on app shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
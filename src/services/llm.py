@@ -3,12 +3,13 @@
 import os
 import asyncio
 import random
-import json
 from enum import Enum
-from typing import Dict
+from typing import AsyncIterator, Dict, Tuple
 
+import orjson
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from src.cache.memory_cache import llm_response_cache, response_cache_key
 from src.utils.logger import log_llm
 
 
@@ -16,9 +17,13 @@ class LLMTier(Enum):
     """    
     FAST: Used for quick tasks like reflection, simple summaries.
     SMART: Used for complex planning, deep reasoning, and final synthesis.
+    REFLECT: Researcher reflection (short JSON decisions). Falls back to the FAST model.
+    SUMMARIZE: Researcher topic summaries. Falls back to the FAST model.
     """
     FAST = "fast"
     SMART = "smart"
+    REFLECT = "reflect"
+    SUMMARIZE = "summarize"
 
 
 class GeminiLLM:
@@ -30,7 +35,7 @@ class GeminiLLM:
 
         Args:
             model (str): The model identifier.
-            tier_name (str): 'FAST' or 'SMART' for logging context.
+            tier_name (str): Tier name ('FAST', 'SMART', ...) for logging context.
         """
         genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
         self.model = genai.GenerativeModel(model)
@@ -45,7 +50,7 @@ class GeminiLLM:
             HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
         }
     
-    async def generate(self, prompt: str, max_tokens: int = 4000, json_mode: bool = False) -> str:
+    async def generate(self, prompt: str, max_tokens: int = 4000, json_mode: bool = False, use_cache: bool = False) -> str:
         """
         Generate text from the LLM.
 
@@ -53,6 +58,7 @@ class GeminiLLM:
             prompt (str): The input prompt.
             max_tokens (int): Max output tokens.
             json_mode (bool): If True, requests JSON MIME type.
+            use_cache (bool): If True, reuse the response to an identical earlier request (process-wide).
 
         Returns:
             str: The generated text. If json_mode is True and generation fails, returns '{}'.
@@ -60,6 +66,23 @@ class GeminiLLM:
         Raises:
             Exception: If max retries are exceeded or a non-retryable error occurs.
         """
+        if not use_cache:
+            text, _ = await self._generate(prompt, max_tokens, json_mode)
+            return text
+        
+        key = response_cache_key(self.model_name, prompt, max_tokens, json_mode)
+        cached = llm_response_cache.get(key)
+        if cached is not None:
+            log_llm("Response cache hit", tier=self.tier)
+            return cached
+        
+        text, complete = await self._generate(prompt, max_tokens, json_mode)
+        if complete:
+            llm_response_cache.set(key, text)
+        return text
+    
+    async def _generate(self, prompt: str, max_tokens: int, json_mode: bool) -> Tuple[str, bool]:
+        """Call the model with retries. Returns (text, whether the text is a real model response worth caching)"""
         generation_config = {"max_output_tokens": max_tokens}
         if json_mode:
             generation_config["response_mime_type"] = "application/json"
@@ -76,19 +99,19 @@ class GeminiLLM:
                 
                 # 99% of the time, valid content is in parts
                 if response.parts:
-                    return response.text
+                    return response.text, True
                 
                 # Fallback checks
                 if response.candidates:
                     finish_reason = response.candidates[0].finish_reason
                     if finish_reason == 2:
-                        return response.text
+                        return response.text, True
                     # 3 (SAFETY) or 4 (RECITATION)
                     if finish_reason in [3, 4]:
                         log_llm("Content blocked by safety filters", level="warning", tier=self.tier)
-                        return '{}' if json_mode else "Content blocked."
+                        return ('{}' if json_mode else "Content blocked."), False
                 
-                return '{}' if json_mode else ""
+                return ('{}' if json_mode else ""), False
                 
             except Exception as e:
                 if not self._should_retry(e, attempt, max_retries):
@@ -101,21 +124,91 @@ class GeminiLLM:
                 
         raise Exception("Max retries exceeded for LLM generation")
     
-    async def generate_json(self, prompt: str, max_tokens: int = 4000) -> Dict:
+    async def astream(self, prompt: str, max_tokens: int = 4000, use_cache: bool = False) -> AsyncIterator[str]:
+        """
+        Stream generated text as it arrives.
+
+        Args:
+            prompt (str): The input prompt.
+            max_tokens (int): Max output tokens.
+            use_cache (bool): If True, replay an identical earlier response as a single chunk,
+                and cache this one once the stream has been consumed to the end.
+
+        Yields:
+            str: Text chunks in order.
+
+        Raises:
+            Exception: If max retries are exceeded, a non-retryable error occurs,
+                or the stream fails after text was already yielded.
+        """
+        if not use_cache:
+            async for piece in self._astream(prompt, max_tokens):
+                yield piece
+            return
+        
+        key = response_cache_key(self.model_name, prompt, max_tokens, False)
+        cached = llm_response_cache.get(key)
+        if cached is not None:
+            log_llm("Response cache hit", tier=self.tier)
+            yield cached
+            return
+        
+        pieces = []
+        async for piece in self._astream(prompt, max_tokens):
+            pieces.append(piece)
+            yield piece
+        if pieces:
+            llm_response_cache.set(key, "".join(pieces))
+    
+    async def _astream(self, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+        """Stream from the model with retries before the first chunk"""
+        generation_config = {"max_output_tokens": max_tokens}
+        max_retries = 5
+        
+        for attempt in range(max_retries):
+            started = False
+            try:
+                response = await self.model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config,
+                    safety_settings=self.safety_settings,
+                    stream=True
+                )
+                
+                async for chunk in response:
+                    if chunk.parts:
+                        started = True
+                        yield chunk.text
+                return
+                
+            except Exception as e:
+                # Chunks already handed to the caller can't be taken back, so only retry a clean start
+                if started or not self._should_retry(e, attempt, max_retries):
+                    log_llm(f"Error: {str(e)[:100]}", level="error", tier=self.tier)
+                    raise e
+                
+                delay = self._calculate_delay(attempt)
+                log_llm(f"Rate limit. Retrying in {delay:.1f}s...", level="warning", tier=self.tier)
+                await asyncio.sleep(delay)
+        
+        raise Exception("Max retries exceeded for LLM generation")
+    
+    async def generate_json(self, prompt: str, max_tokens: int = 4000, use_cache: bool = False) -> Dict:
         """
         Helper method to generate and parse JSON directly.
 
         Args:
             prompt (str): Input prompt.
             max_tokens (int): Max tokens.
+            use_cache (bool): If True, reuse the response to an identical earlier request.
 
         Returns:
             Dict: Parsed JSON dictionary.
         """
-        json_str = await self.generate(prompt, max_tokens=max_tokens, json_mode=True)
+        json_str = await self.generate(prompt, max_tokens=max_tokens, json_mode=True, use_cache=use_cache)
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
             log_llm("Failed to decode JSON response", level="error", tier=self.tier)
             return {}
     
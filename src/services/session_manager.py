@@ -1,32 +1,52 @@
 """Session management and service isolation."""
 
 import os
+import time
+import heapq
 import asyncio
 import threading
-from typing import Optional, Dict
+import functools
+import contextvars
+from typing import Optional, Dict, List, Tuple
 
-from src.cache.memory_cache import SimpleCache, CachedGoogleSearcher, CachedJinaScraper
+from src.config.constants import SESSION_TTL
+from src.cache.memory_cache import SimpleCache, CachedGoogleSearcher, CachedJinaScraper, shared_scrape_cache, llm_response_cache, embedding_cache
 from src.rag.store import RAGStore
 from .llm import GeminiLLM, LLMTier
+from .http_client import get_http_client
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_llm(tier: LLMTier) -> GeminiLLM:
+    """GeminiLLM holds no session state, so one instance per tier serves every session"""
+    fast_model = os.getenv("GEMINI_MODEL_FAST", "gemini-2.0-flash-lite")
+    if tier == LLMTier.FAST:
+        return GeminiLLM(fast_model, "FAST")
+    if tier == LLMTier.REFLECT:
+        return GeminiLLM(os.getenv("RESEARCHER_REFLECT_MODEL") or fast_model, "REFLECT")
+    if tier == LLMTier.SUMMARIZE:
+        return GeminiLLM(os.getenv("RESEARCHER_SUMMARIZE_MODEL") or fast_model, "SUMMARIZE")
+    return GeminiLLM(os.getenv("GEMINI_MODEL_SMART", "gemini-2.0-flash"), "SMART")
 
 class SessionServices:
     """Isolated services for a single user session"""
     
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, ttl: float = SESSION_TTL):
         self.session_id = session_id
-        self.created_at = asyncio.get_event_loop().time()
+        self.created_at = time.monotonic()
+        self.expires_at = self.created_at + ttl
+        
+        http_client = get_http_client()
         
         self._cache = SimpleCache()
         self._searcher = CachedGoogleSearcher(
             os.getenv("GOOGLE_SEARCH_API_KEY"),
             os.getenv("GOOGLE_CSE_ID"),
-            self._cache
+            self._cache,
+            client=http_client
         )
-        self._scraper = CachedJinaScraper(self._cache)
+        self._scraper = CachedJinaScraper(self._cache, client=http_client)
         self._rag = RAGStore(os.getenv("JINA_API_KEY"))
-        
-        self._llm_fast = None
-        self._llm_smart = None
     
     def get_cache(self) -> SimpleCache:
         return self._cache
@@ -40,15 +60,8 @@ class SessionServices:
     def get_rag_store(self) -> RAGStore:
         return self._rag
     
-    def get_llm(self, tier: LLMTier = LLMTier.FAST):
-        if tier == LLMTier.FAST:
-            if self._llm_fast is None:
-                self._llm_fast = GeminiLLM(os.getenv("GEMINI_MODEL_FAST", "gemini-2.0-flash-lite"), "FAST")
-            return self._llm_fast
-        else:
-            if self._llm_smart is None:
-                self._llm_smart = GeminiLLM(os.getenv("GEMINI_MODEL_SMART", "gemini-2.0-flash"), "SMART")
-            return self._llm_smart
+    def get_llm(self, tier: LLMTier = LLMTier.FAST) -> GeminiLLM:
+        return _shared_llm(tier)
     
     def cleanup(self):
         print(f"Cleaning up session {self.session_id[:8]}...")
@@ -62,12 +75,22 @@ class SessionManager:
     def __init__(self):
         self._sessions: Dict[str, SessionServices] = {}
         self._lock = threading.Lock()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_wakeup = asyncio.Event()
     
     def get_or_create_session(self, session_id: str) -> SessionServices:
         """Retrieve existing session or start a new one"""
+        # Every service getter lands here; a dict read is atomic, so existing sessions skip the lock
+        session = self._sessions.get(session_id)
+        if session is not None:
+            return session
+        
         with self._lock:
             if session_id not in self._sessions:
-                self._sessions[session_id] = SessionServices(session_id)
+                session = SessionServices(session_id)
+                self._sessions[session_id] = session
+                heapq.heappush(self._expiry_heap, (session.expires_at, session_id))
+                self._expiry_wakeup.set()
                 print(f"Created new session: {session_id[:8]}")
             return self._sessions[session_id]
     
@@ -82,10 +105,55 @@ class SessionManager:
         with self._lock:
             return len(self._sessions)
     
+    def get_cache_stats(self) -> Dict:
+        """Sum cache statistics across all active sessions, plus the process-wide scrape, LLM and embedding caches"""
+        totals: Dict = {}
+        with self._lock:
+            for session in self._sessions.values():
+                for key, value in session.get_cache().get_stats().items():
+                    totals[key] = totals.get(key, 0) + value
+        totals["shared_scrape"] = shared_scrape_cache.get_stats()
+        totals["llm_response"] = llm_response_cache.get_stats()
+        totals["embedding"] = embedding_cache.get_stats()
+        return totals
+    
+    def expire_due_sessions(self, now: float) -> Optional[float]:
+        """
+        Clean up every session whose TTL has passed.
+
+        Pops the expiry heap only while its head is due, so the cost is
+        O(log N) per expired session rather than a scan of all sessions.
+
+        Returns:
+            Optional[float]: Monotonic time of the next expiry, or None if no sessions remain.
+        """
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expires_at, sid = heapq.heappop(self._expiry_heap)
+                session = self._sessions.get(sid)
+                # Skip stale entries for sessions already closed by their WebSocket
+                if session is not None and session.expires_at == expires_at:
+                    session.cleanup()
+                    del self._sessions[sid]
+            return self._expiry_heap[0][0] if self._expiry_heap else None
+    
+    async def run_expiry_loop(self, idle_interval: float = 60.0):
+        """Background task that sleeps until the next session expires, then cleans it up"""
+        while True:
+            now = time.monotonic()
+            next_expiry = self.expire_due_sessions(now)
+            timeout = max(1.0, next_expiry - now) if next_expiry is not None else idle_interval
+            
+            self._expiry_wakeup.clear()
+            try:
+                await asyncio.wait_for(self._expiry_wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    
     def cleanup_old_sessions(self, max_age_seconds: float = 3600):
         """Garbage collection for abandoned sessions"""
         with self._lock:
-            now = asyncio.get_event_loop().time()
+            now = time.monotonic()
             old_sessions = [
                 sid for sid, session in self._sessions.items()
                 if now - session.created_at > max_age_seconds
@@ -95,16 +163,21 @@ class SessionManager:
                 del self._sessions[sid]
 
 _session_manager = SessionManager()
-_current_session_id = threading.local()
+# Task-local: every WebSocket runs on the same loop thread, so a threading.local would leak across sessions.
+# Tasks spawned by asyncio.gather/create_task inherit a copy of the caller's context.
+_current_session_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_session_id", default=None)
 
 def get_session_manager() -> SessionManager:
     return _session_manager
 
 def set_current_session(session_id: str):
-    _current_session_id.value = session_id
+    # Pipeline methods re-assert the session on every call; skip the redundant Token allocation
+    if _current_session_id.get() == session_id:
+        return
+    _current_session_id.set(session_id)
 
 def get_current_session() -> Optional[str]:
-    return getattr(_current_session_id, 'value', None)
+    return _current_session_id.get()
 
 def get_current_services() -> SessionServices:
     session_id = get_current_session()
@@ -123,10 +196,12 @@ def get_memory_stats() -> dict:
             "rss_mb": memory_info.rss / 1024 / 1024,
             "percent": process.memory_percent(),
             "active_sessions": _session_manager.get_active_sessions(),
+            "cache": _session_manager.get_cache_stats(),
             "available": True
         }
     except ImportError:
         return {
             "available": False, 
-            "active_sessions": _session_manager.get_active_sessions()
+            "active_sessions": _session_manager.get_active_sessions(),
+            "cache": _session_manager.get_cache_stats()
         }
\ No newline at end of file
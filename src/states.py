@@ -1,6 +1,7 @@
 """States with quality metrics and structured results"""
 
-from typing import TypedDict, List, Optional, Dict
+import operator
+from typing import AbstractSet, Annotated, TypedDict, List, Optional, Dict, Set
 
 
 class RAGContext(TypedDict):
@@ -21,28 +22,38 @@ class RetryInfo(TypedDict):
     """Metadata for tracking failed attempts at a topic"""
     topic: str
     attempt: int
+    last_attempt_at: float
+    next_attempt_at: float
     last_error: str
 
 
 class ResearcherState(TypedDict):
-    """State for individual researcher agent."""
+    """
+    State for individual researcher agent.
+
+    Fields annotated with operator.add / operator.or_ are append-only: nodes return just the
+    new items and LangGraph merges them, instead of each node copying the whole collection.
+    """
     topic: str
     parent_query: str
     
-    searches: List[str]
-    scraped_urls: List[str]
+    searches: Annotated[List[str], operator.add]
+    seen_urls: AbstractSet[str]
+    scraped_urls: Annotated[Set[str], operator.or_]
 
     rag: RAGContext
-    scraped_content: List[dict]
+    scraped_content: Annotated[List[dict], operator.add]
     retrieved_chunks: List[dict]
 
-    reflections: List[Dict]
+    reflections: Annotated[List[Dict], operator.add]
     iteration: int
     max_iterations: int
     
     findings: str
-    sources: List[dict]
-    gaps: List[str]
+    defer_summary: bool
+    summary_request: Optional[Dict]
+    sources: Annotated[List[dict], operator.add]
+    gaps: Annotated[List[str], operator.add]
     quality_metrics: Optional[QualityMetrics]
 
 
@@ -50,14 +61,23 @@ class OrchestratorState(TypedDict):
     """The global memory of the Orchestrator. Scope: The entire user session"""
     query: str
     depth: str
-    sub_topics: List[str]
+    sub_topics: Annotated[List[str], operator.add]
+    pending_topics: Set[str]
+    failed_topics: Set[str]
     iteration: int
     max_iterations: int
-    completed: List[dict]
-    all_sources: List[dict]
+    completed: Annotated[List[dict], operator.add]
+    confidence_sum: float
+    confidence_count: int
+    all_sources: Annotated[List[dict], operator.add]
+    unique_sources: List[dict]
+    url_to_id: Dict[str, int]
+    # Replaced (never mutated) each round: researchers of the next round hold a reference to it
+    global_scraped_urls: Set[str]
     identified_gaps: List[str]
     report: str
     retry_queue: List[RetryInfo]
+    followup_topics: Optional[List[str]]
     overall_quality: Optional[QualityMetrics]
     synthesis_result: Optional[Dict]
 
@@ -20,24 +20,23 @@ def extract_citations_from_text(text: str) -> Set[int]:
     return cited_ids
 
 
-def export_to_markdown_from_json(result: Dict, output_path: str) -> bool:
-    """Export research result as Markdown file."""
+def export_to_markdown_string(result: Dict) -> str:
+    """Render a research result as a Markdown document."""
+    query = result.get("query", "Research Report")
+    report_text = result.get("report_text", "")
+    sources = result.get("sources", [])
+    quality = result.get("quality_metrics", {})
+    timestamp = result.get("timestamp", datetime.now().isoformat())
+    
     try:
-        query = result.get("query", "Research Report")
-        report_text = result.get("report_text", "")
-        sources = result.get("sources", [])
-        quality = result.get("quality_metrics", {})
-        timestamp = result.get("timestamp", datetime.now().isoformat())
-        
-        try:
-            dt = datetime.fromisoformat(timestamp)
-            formatted_time = dt.strftime('%Y-%m-%d %H:%M:%S')
-        except:
-            formatted_time = timestamp
-        
-        cited_ids = extract_citations_from_text(report_text)
+        dt = datetime.fromisoformat(timestamp)
+        formatted_time = dt.strftime('%Y-%m-%d %H:%M:%S')
+    except:
+        formatted_time = timestamp
+    
+    cited_ids = extract_citations_from_text(report_text)
 
-        md = f"""# Research Report
+    md = f"""# Research Report
 
 **Query:** {query}  
 **Generated:** {formatted_time}  
@@ -48,18 +47,26 @@ def export_to_markdown_from_json(result: Dict, output_path: str) -> bool:
 ---
 
 """
-        
-        md += report_text.strip()
-        md += "\n\n---\n\n## References\n\n"
-        
-        source_map = {s.get('id'): s for s in sources}
-        
-        for source_id in sorted(cited_ids):
-            if source_id in source_map:
-                source = source_map[source_id]
-                title = source.get('title', 'Untitled')
-                url = source.get('url', '#')
-                md += f"[{source_id}] **{title}**  \n    {url}\n\n"
+    
+    md += report_text.strip()
+    md += "\n\n---\n\n## References\n\n"
+    
+    source_map = {s.get('id'): s for s in sources}
+    
+    for source_id in sorted(cited_ids):
+        if source_id in source_map:
+            source = source_map[source_id]
+            title = source.get('title', 'Untitled')
+            url = source.get('url', '#')
+            md += f"[{source_id}] **{title}**  \n    {url}\n\n"
+    
+    return md
+
+
+def export_to_markdown_from_json(result: Dict, output_path: str) -> bool:
+    """Export research result as Markdown file."""
+    try:
+        md = export_to_markdown_string(result)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(md)
@@ -0,0 +1,6 @@
+"""URL helpers shared by the cache and the research nodes"""
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used to dedupe sources (fragment and trailing slash dropped)"""
+    return url.split("#", 1)[0].rstrip("/")
@@ -0,0 +1,85 @@
+"""
+WebSocket wire format. Server messages are orjson-encoded JSON sent as binary frames.
+Client messages are msgpack binary frames, with JSON accepted for older clients.
+
+Common envelopes are pre-encoded byte prefixes, so the hot path only serializes the payload.
+
+Report streaming uses raw frames: a 5-byte header (kind: u8, length: u32, big-endian)
+followed by the payload. JSON frames always start with '{', which is never a valid kind.
+"""
+
+import struct
+from typing import Dict
+
+import msgpack
+import orjson
+from fastapi import WebSocket, WebSocketDisconnect
+
+
+FRAME_DONE = 0
+FRAME_MARKDOWN = 1
+FRAME_CITATIONS = 2
+
+STREAM_FRAME_SIZE = 16 * 1024
+
+_FRAME_HEADER = struct.Struct(">BI")
+
+
+def _envelope_prefix(msg_type: str, field: str) -> bytes:
+    """Encode '{"type":<msg_type>,"<field>":' once at import"""
+    return b'{"type":' + orjson.dumps(msg_type) + b',' + orjson.dumps(field) + b':'
+
+
+STATUS_BATCH = _envelope_prefix("status_batch", "messages")
+ERROR = _envelope_prefix("error", "message")
+PLAN_GENERATED = _envelope_prefix("plan_generated", "plan")
+PLAN_REFINED = _envelope_prefix("plan_refined", "plan")
+COMPLETE = _envelope_prefix("complete", "result")
+
+CLEARED = b'{"type":"cleared"}'
+SYNTHESIS_START = b'{"type":"synthesis_start"}'
+
+_ENVELOPE_END = b"}"
+
+
+async def send_frame(ws: WebSocket, kind: int, payload: bytes = b""):
+    """Send a length-prefixed binary frame"""
+    await ws.send_bytes(_FRAME_HEADER.pack(kind, len(payload)) + payload)
+
+
+async def send_message(ws: WebSocket, payload: Dict):
+    """Serialize a message with orjson and send it as a binary frame"""
+    await ws.send_bytes(orjson.dumps(payload))
+
+
+async def send_envelope(ws: WebSocket, prefix: bytes, value):
+    """Send a pre-encoded envelope prefix with an orjson-encoded value"""
+    await ws.send_bytes(prefix + orjson.dumps(value) + _ENVELOPE_END)
+
+
+async def send_error(ws: WebSocket, message: str):
+    """Send an error message to the client"""
+    await send_envelope(ws, ERROR, message)
+
+
+async def receive_message(ws: WebSocket) -> Dict:
+    """
+    Receive and decode one client message.
+
+    Binary frames are msgpack unless they start with '{' (JSON sent as bytes).
+    Text frames are parsed as JSON.
+
+    Raises:
+        WebSocketDisconnect: If the client closed the connection.
+    """
+    message = await ws.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+
+    raw = message.get("bytes")
+    if raw:
+        if raw[:1] == b"{":
+            return orjson.loads(raw)
+        return msgpack.unpackb(raw, raw=False)
+
+    return orjson.loads(message.get("text") or "{}")